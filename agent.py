@@ -0,0 +1,221 @@
+"""Gym-style step/reset interface over headless Rail Shooter games.
+
+ShooterEnv wraps one game, VectorEnv steps many of them together. Actions
+are (target_x, target_y, fire, slow_motion); observations are written into
+preallocated NumPy arrays, so stepping allocates no new arrays.
+
+    python agent.py --envs 16 --steps 2000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from inputs import TickInput
+from rail_shooter import SCREEN_HEIGHT, SCREEN_WIDTH, TICK_MS, GameState
+from simulation import Simulation
+
+# Columns of the observation arrays
+SHIP_COLUMNS = ("ship_x", "ship_y", "shield", "slow_motion_charge", "slow_motion_active",
+                "game_time")
+ENTITY_COLUMNS = ("x", "y", "velocity_x", "velocity_y")
+ENEMY_COLUMNS = ENTITY_COLUMNS + ("health",)
+# Order of the per-game entity counts
+COUNTS = ("enemies", "power_ups", "bullets")
+
+
+class Observations:
+    # Observation arrays for one game, or for a batch of games with a
+    # leading game axis. Entity rows past the game's count are zero; games
+    # with more entities than rows report the oldest ones, which are the
+    # furthest down the corridor.
+    def __init__(self, ship, enemies, power_ups, bullets, counts):
+        self.ship = ship
+        self.enemies = enemies
+        self.power_ups = power_ups
+        self.bullets = bullets
+        self.counts = counts
+
+    @classmethod
+    def allocate(cls, n, max_enemies=32, max_power_ups=8, max_bullets=64):
+        return cls(np.zeros((n, len(SHIP_COLUMNS)), np.float32),
+                   np.zeros((n, max_enemies, len(ENEMY_COLUMNS)), np.float32),
+                   np.zeros((n, max_power_ups, len(ENTITY_COLUMNS)), np.float32),
+                   np.zeros((n, max_bullets, len(ENTITY_COLUMNS)), np.float32),
+                   np.zeros((n, len(COUNTS)), np.int32))
+
+    def __getitem__(self, index):
+        # Views of one game's rows; writing to them fills the batch
+        return Observations(self.ship[index], self.enemies[index], self.power_ups[index],
+                            self.bullets[index], self.counts[index])
+
+
+def observe_table(table, out, dt):
+    # Positions and last-tick velocities of the first len(out) rows
+    n = min(table.count, len(out))
+    x = table.x[:n]
+    y = table.y[:n]
+    out[:n, 0] = x
+    out[:n, 1] = y
+    np.subtract(x, table.prev_x[:n], out=out[:n, 2])
+    np.subtract(y, table.prev_y[:n], out=out[:n, 3])
+    out[:n, 2:4] /= dt
+    out[n:] = 0
+    return n
+
+
+class ShooterEnv:
+    # One headless game behind reset()/step(). Every step applies the action
+    # as that tick's input and then runs ticks_per_step ticks. The reward is
+    # the score gained during the step; an episode terminates at game over
+    # and is truncated after max_steps steps.
+    #
+    # observations may be a view into a larger batch (see VectorEnv), in
+    # which case the game writes its observations straight into it.
+    def __init__(self, seed=None, waves=None, dt=TICK_MS / 1000.0, ticks_per_step=1,
+                 max_steps=None, observations=None, **limits):
+        self.waves = waves
+        self.dt = dt
+        self.ticks_per_step = ticks_per_step
+        self.max_steps = max_steps
+        if observations is None:
+            observations = Observations.allocate(1, **limits)[0]
+        self.observation = observations
+        # Seeds of successive episodes
+        self.seeds = random.Random(seed)
+        self.tick = TickInput(0, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.info = {}
+        self.sim = None
+        self.steps = 0
+
+    @property
+    def game(self):
+        return self.sim.game
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = self.seeds.randrange(2**63)
+        self.sim = Simulation(dt=self.dt, seed=seed, waves=self.waves)
+        self.steps = 0
+        self.info["seed"] = seed
+        return self.observe()
+
+    def observe(self):
+        game = self.game
+        observation = self.observation
+        ship = observation.ship
+        ship[0] = game.ship_x
+        ship[1] = game.ship_y
+        ship[2] = game.shield
+        ship[3] = game.slow_motion_charge
+        ship[4] = game.slow_motion_active
+        ship[5] = game.game_time
+
+        counts = observation.counts
+        enemies = observation.enemies
+        n = counts[0] = observe_table(game.enemies, enemies, self.dt)
+        enemies[:n, 4] = game.enemies.health[:n]
+        counts[1] = observe_table(game.power_ups, observation.power_ups, self.dt)
+        counts[2] = observe_table(game.bullets, observation.bullets, self.dt)
+
+        info = self.info
+        info["score"] = game.score
+        info["steps"] = self.steps
+        return observation
+
+    def step(self, action):
+        target_x, target_y, fire, slow_motion = action
+        game = self.game
+        tick = self.tick
+        tick.crosshair_x = int(target_x)
+        tick.crosshair_y = int(target_y)
+        tick.shots.clear()
+        if fire:
+            tick.shots.append((tick.crosshair_x, tick.crosshair_y))
+        tick.slow_motion = bool(slow_motion)
+
+        score = game.score
+        game.apply_input(tick)
+        sim = self.sim
+        for _ in range(self.ticks_per_step):
+            sim.step()
+            if game.state == GameState.GAME_OVER:
+                break
+        self.steps += 1
+
+        terminated = game.state == GameState.GAME_OVER
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return self.observe(), game.score - score, terminated, truncated, self.info
+
+
+class VectorEnv:
+    # n independent games stepped together, with observations, rewards and
+    # episode flags batched along the first axis. A game whose episode ends
+    # is reset straight away, so the returned observation is already the
+    # first of its next episode; infos[i]["final_score"] has the score it
+    # ended with.
+    def __init__(self, n, seed=None, waves=None, dt=TICK_MS / 1000.0, ticks_per_step=1,
+                 max_steps=None, **limits):
+        self.observations = Observations.allocate(n, **limits)
+        seeds = random.Random(seed)
+        self.envs = [ShooterEnv(seeds.randrange(2**63), waves, dt, ticks_per_step, max_steps,
+                                self.observations[i]) for i in range(n)]
+        self.rewards = np.zeros(n, np.float32)
+        self.terminated = np.zeros(n, np.bool_)
+        self.truncated = np.zeros(n, np.bool_)
+        self.infos = [env.info for env in self.envs]
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self):
+        for env in self.envs:
+            env.reset()
+        return self.observations
+
+    def step(self, actions):
+        # actions is an (n, 4) array of (target_x, target_y, fire, slow_motion)
+        rewards = self.rewards
+        terminated = self.terminated
+        truncated = self.truncated
+        for i, (env, action) in enumerate(zip(self.envs, actions.tolist())):
+            # final_score only shows on the step an episode ended
+            env.info.pop("final_score", None)
+            _, rewards[i], terminated[i], truncated[i], info = env.step(action)
+            if terminated[i] or truncated[i]:
+                score = info["score"]
+                env.reset()
+                info["final_score"] = score
+        return self.observations, rewards, terminated, truncated, self.infos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step Rail Shooter games with random actions")
+    parser.add_argument("--envs", type=int, default=16, help="games stepped together")
+    parser.add_argument("--steps", type=int, default=2000, help="steps per game")
+    parser.add_argument("--ticks-per-step", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    envs = VectorEnv(args.envs, seed=args.seed, ticks_per_step=args.ticks_per_step)
+    envs.reset()
+    rng = np.random.default_rng(args.seed)
+    actions = np.zeros((args.envs, 4))
+    start = time.perf_counter()
+    total = 0.0
+    for _ in range(args.steps):
+        actions[:, 0] = rng.uniform(0, SCREEN_WIDTH, args.envs)
+        actions[:, 1] = rng.uniform(0, SCREEN_HEIGHT, args.envs)
+        actions[:, 2] = rng.random(args.envs) < 0.1
+        _, rewards, _, _, _ = envs.step(actions)
+        total += rewards.sum()
+    wall_time = time.perf_counter() - start
+
+    samples = args.envs * args.steps
+    print(f"samples={samples} wall_time={wall_time:.3f}s "
+          f"({samples / wall_time:.0f} samples/s) total_reward={total:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class EntityBatch:
+    # Structure-of-arrays entity store. Every field in `fields` is a NumPy
+    # column and live entities are packed into rows [0, count), so per-frame
+    # logic runs as whole-array operations over the live slice. Capacity
+    # doubles when full; removed rows are reclaimed by masked compaction.
+    #
+    # A batch is also the pool its entities are recycled through: rows past
+    # `count` are free slots that add() and extend() fill in place, removal
+    # packs the survivors down in one pass, and clear() returns every row
+    # at once. Columns are only allocated when the capacity doubles, so
+    # spawning, killing and restarting the game allocate nothing per entity.
+    fields = {"active": np.bool_}
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in self.fields.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        new_capacity = self.capacity * 2
+        for name in self.fields:
+            column = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+        self.capacity = new_capacity
+
+    def add(self, **values):
+        if self.count == self.capacity:
+            self.grow()
+        index = self.count
+        for name, value in values.items():
+            getattr(self, name)[index] = value
+        self.count += 1
+        return index
+
+    def extend(self, count, **values):
+        # Append count rows at once; values are arrays of length count or
+        # scalars shared by every new row
+        while self.count + count > self.capacity:
+            self.grow()
+        start = self.count
+        end = start + count
+        for name, value in values.items():
+            getattr(self, name)[start:end] = value
+        self.count = end
+        return start
+
+    def compact(self, keep):
+        # keep is a boolean mask over the live rows
+        if self.count == 0:
+            return
+        indices = np.flatnonzero(keep)
+        k = len(indices)
+        if k == self.count:
+            return
+        for name in self.fields:
+            column = getattr(self, name)
+            column[:k] = column[indices]
+        self.count = k
+
+    def remove_inactive(self):
+        self.compact(self.active[:self.count])
+
+    def clear(self):
+        self.count = 0
+
+    def snapshot(self):
+        # Live rows of every column, column after column
+        n = self.count
+        return b"".join(getattr(self, name)[:n].tobytes() for name in self.fields)
+
+    def restore(self, count, data):
+        while self.capacity < count:
+            self.grow()
+        offset = 0
+        for name in self.fields:
+            column = getattr(self, name)
+            column[:count] = np.frombuffer(data, dtype=column.dtype, count=count, offset=offset)
+            offset += count * column.itemsize
+        self.count = count
+
+    def interpolate(self, alpha):
+        # Render positions between the previous and the current tick, for
+        # batches that keep prev_x/prev_y columns next to x/y
+        n = self.count
+        if alpha >= 1.0:
+            return self.x[:n], self.y[:n]
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        return (prev_x + (self.x[:n] - prev_x) * alpha,
+                prev_y + (self.y[:n] - prev_y) * alpha)
@@ -0,0 +1,148 @@
+"""Bullet-vs-enemy collision scaling: brute force, the uniform grid and the
+vectorized swept test RailShooter.update uses.
+
+The brute-force and grid passes are the point tests the game used before
+swept collisions; they are kept here as the reference the swept test is
+checked against.
+
+Run from the repository root:
+
+    python -m benchmarks.collision_bench
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from collision import grid_pairs, swept_contact
+from rail_shooter import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class SpatialGrid:
+    # Uniform-grid broad phase keyed on integer cell coordinates. Circles are
+    # inserted into every cell their bounding box overlaps, so a point query
+    # only has to look at the single cell that contains the point.
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item, x, y, radius):
+        cs = self.cell_size
+        min_cx = int((x - radius) // cs)
+        max_cx = int((x + radius) // cs)
+        min_cy = int((y - radius) // cs)
+        max_cy = int((y + radius) // cs)
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def query(self, x, y):
+        # Items are returned in insertion order
+        return self.cells.get((int(x // self.cell_size), int(y // self.cell_size)), ())
+
+
+def circle_contains(cx, cy, radius, x, y):
+    dx = x - cx
+    dy = y - cy
+    return dx * dx + dy * dy < radius * radius
+
+
+def make_scene(n_bullets, n_enemies, rng):
+    bullets = []
+    for _ in range(n_bullets):
+        x = rng.uniform(0, SCREEN_WIDTH)
+        y = rng.uniform(0, SCREEN_HEIGHT)
+        bullets.append((x, y))
+    # Enemies as (x, y, size), the rows RailShooter.update reads from EnemyBatch
+    enemies = []
+    for _ in range(n_enemies):
+        size = 25 if rng.random() < 0.2 else 15
+        enemies.append((rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), size))
+    return bullets, enemies
+
+
+def brute_force(bullets, enemies):
+    hits = 0
+    for bx, by in bullets:
+        for x, y, size in enemies:
+            if circle_contains(x, y, size, bx, by):
+                hits += 1
+                break
+    return hits
+
+
+def grid_pass(bullets, enemies, grid):
+    grid.clear()
+    for enemy in enemies:
+        grid.insert(enemy, *enemy)
+    hits = 0
+    for bx, by in bullets:
+        for x, y, size in grid.query(bx, by):
+            if circle_contains(x, y, size, bx, by):
+                hits += 1
+                break
+    return hits
+
+
+def swept_pass(bullet_array, enemy_array):
+    # Stationary bullets and enemies, so the swept test reduces to the point test
+    bx, by = bullet_array
+    ex, ey, size = enemy_array
+    b, e = grid_pairs((bx, by, bx, by), (ex - size, ey - size, ex + size, ey + size))
+    t = swept_contact(bx[b], by[b], bx[b], by[b], ex[e], ey[e], ex[e], ey[e], size[e])
+    return len(np.unique(b[np.isfinite(t)]))
+
+
+def best_of(func, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 500, 1000, 2000, 5000, 10000],
+                        help="entity counts (bullets = enemies = N)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--brute-force-limit", type=int, default=2000,
+                        help="skip the O(n^2) pass above this N")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    grid = SpatialGrid(cell_size=64)
+
+    print(f"{'N':>8} {'brute ms':>10} {'grid ms':>10} {'speedup':>8} {'swept ms':>10}")
+    for n in args.sizes:
+        bullets, enemies = make_scene(n, n, rng)
+        grid_time, grid_hits = best_of(lambda: grid_pass(bullets, enemies, grid), args.repeats)
+        # The game keeps its entities in arrays already
+        bullet_array = np.array(bullets).T
+        enemy_array = np.array(enemies).T
+        swept_time, swept_hits = best_of(lambda: swept_pass(bullet_array, enemy_array), args.repeats)
+        assert swept_hits == grid_hits, (swept_hits, grid_hits)
+        if n <= args.brute_force_limit:
+            brute_time, brute_hits = best_of(lambda: brute_force(bullets, enemies), args.repeats)
+            assert brute_hits == grid_hits, (brute_hits, grid_hits)
+            print(f"{n:>8} {brute_time * 1000:>10.2f} {grid_time * 1000:>10.2f} "
+                  f"{brute_time / grid_time:>7.1f}x {swept_time * 1000:>10.2f}")
+        else:
+            print(f"{n:>8} {'-':>10} {grid_time * 1000:>10.2f} {'-':>8} {swept_time * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""RailShooter.update() and draw() under synthetic entity loads.
+
+Each scenario fills a game with a given number of bullets, enemies, power-ups
+and particles and times update() and draw() separately, drawing into the
+in-memory display surface of the SDL dummy video driver. Results can be
+saved as a JSON baseline and later compared against it; the comparison exits
+non-zero when any scenario is slower than the baseline by more than the
+threshold.
+
+Run from the repository root:
+
+    python -m benchmarks.frame_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.frame_bench --compare benchmarks/baseline.json
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from rail_shooter import ORANGE, SCREEN_HEIGHT, SCREEN_WIDTH, RailShooter
+
+KINDS = ("bullets", "enemies", "power_ups", "particles")
+
+
+def scenarios(sizes):
+    # One scenario per entity kind and size, plus a mixed load of every kind
+    result = {}
+    for n in sizes:
+        for kind in KINDS:
+            result[f"{kind}-{n}"] = {kind: n}
+        result[f"mixed-{n}"] = {kind: n for kind in KINDS}
+    return result
+
+
+def populate(game, counts, seed):
+    rng = random.Random(seed)
+    particles = counts.get("particles", 0)
+    game.particles.limit = max(game.particles.limit, particles)
+    game.particles.clear()
+
+    for _ in range(counts.get("bullets", 0)):
+        x = rng.uniform(0, SCREEN_WIDTH)
+        y = rng.uniform(0, SCREEN_HEIGHT)
+        game.bullets.spawn(x, y, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+    for _ in range(counts.get("enemies", 0)):
+        enemy_type = "special" if rng.random() < 0.2 else "normal"
+        game.enemies.spawn(rng.uniform(50, SCREEN_WIDTH - 50), rng.uniform(0, SCREEN_HEIGHT - 200),
+                           enemy_type, angle=rng.uniform(0, 6.28))
+    for _ in range(counts.get("power_ups", 0)):
+        game.power_ups.spawn(rng.uniform(50, SCREEN_WIDTH - 50), rng.uniform(0, SCREEN_HEIGHT - 200))
+    # Explosions of 15 particles spread over the screen
+    remaining = particles
+    while remaining > 0:
+        count = min(15, remaining)
+        game.particles.emit(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), ORANGE, count)
+        remaining -= count
+
+
+def fresh_game(counts, seed, render_scale=1.0):
+    game = RailShooter(seed=seed, render_scale=render_scale)
+    # Keep spawning out of the measurement
+    game.enemy_spawn_timer = game.power_up_spawn_timer = -1e9
+    populate(game, counts, seed)
+    return game
+
+
+def time_call(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_scenario(counts, samples, seed, render_scale=1.0):
+    update_ms = []
+    draw_ms = []
+    stages = {}
+    for sample in range(samples):
+        # update() consumes the scene (hits, pickups, expiry), so every
+        # sample starts from a freshly populated game
+        game = fresh_game(counts, seed + sample, render_scale)
+        gc.collect()
+        game.draw()  # warm sprite, corridor and text caches
+        draw_ms.append(min(time_call(game.draw) for _ in range(3)))
+
+        game.profiler.frame = {}
+        game.profiler.begin_frame()
+        update_ms.append(time_call(lambda: game.update(1.0 / 60)))
+        for name, ms in game.profiler.frame.items():
+            stages.setdefault(name, []).append(ms)
+        game.profiler.close()
+
+    return {
+        "counts": counts,
+        "update_ms": statistics.median(update_ms),
+        "draw_ms": statistics.median(draw_ms),
+        "update_stages_ms": {name: statistics.median(values) for name, values in stages.items()},
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    # A scenario regresses when its median time grows by more than threshold
+    # and by more than min_delta_ms, so sub-millisecond noise never fails
+    regressions = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("update_ms", "draw_ms"):
+            if base[metric] <= 0:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold and result[metric] - base[metric] > min_delta_ms:
+                regressions.append((name, metric, base[metric], result[metric], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="entity counts per scenario")
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO",
+                        help="run only these scenarios, e.g. particles-100000 mixed-1000")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="internal resolution as a fraction of the window (default: 1)")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing, as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1,
+                        help="ignore slowdowns smaller than this many ms (default: 0.1)")
+    args = parser.parse_args()
+
+    selected = scenarios(args.sizes)
+    if args.only:
+        selected = {name: selected[name] for name in args.only}
+
+    results = {}
+    print(f"{'scenario':<20} {'update ms':>10} {'draw ms':>10} {'frames/s':>10}")
+    for name, counts in selected.items():
+        result = results[name] = bench_scenario(counts, args.samples, args.seed, args.render_scale)
+        frame_ms = result["update_ms"] + result["draw_ms"]
+        print(f"{name:<20} {result['update_ms']:>10.3f} {result['draw_ms']:>10.3f} "
+              f"{1000 / frame_ms:>10.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for name, metric, before, after, ratio in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.3f} -> {after:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Cold-start latency of the game, measured in fresh interpreters.
+
+Every run starts a new Python process that times importing rail_shooter,
+creating a headless game, creating a windowed game and drawing its first
+frame (which opens the display and loads the fonts), on the SDL dummy video
+driver. The parent also times the whole process, interpreter start-up
+included. Results can be saved as a JSON baseline and later compared against
+it, like frame_bench.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_bench --save-baseline benchmarks/startup.json
+    python -m benchmarks.startup_bench --compare benchmarks/startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs in the child process; prints the phase timings in ms as JSON
+CHILD = """
+import json, time
+start = time.perf_counter()
+times = {}
+def lap(name):
+    global start
+    now = time.perf_counter()
+    times[name] = (now - start) * 1000
+    start = now
+import rail_shooter
+lap("import")
+rail_shooter.RailShooter(headless=True, seed=1)
+lap("headless_game")
+game = rail_shooter.RailShooter(seed=1)
+lap("game")
+game.draw()
+lap("first_frame")
+print(json.dumps(times))
+"""
+
+PHASES = ("import", "headless_game", "game", "first_frame", "process")
+
+
+def measure(runs):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = {name: [] for name in PHASES}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", CHILD], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples["process"].append((time.perf_counter() - start) * 1000)
+        for name, ms in json.loads(output.splitlines()[-1]).items():
+            samples[name].append(ms)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    regressions = []
+    for name, ms in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = ms / base
+        if ratio > 1 + threshold and ms - base > min_delta_ms:
+            regressions.append((name, base, ms, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing, as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore slowdowns smaller than this many ms (default: 5)")
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    print(f"{'phase':<16} {'median ms':>10}")
+    for name in PHASES:
+        print(f"{name:<16} {results[name]:>10.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import math
+import random
+
+from inputs import TickInput
+from rail_shooter import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class AimBot:
+    # Scripted player for headless runs: every fire_interval seconds of game
+    # time it shoots at the enemy furthest down the corridor, leading the
+    # shot by the corridor scroll, and uses slow motion as soon as charged.
+    # Use as a Simulation controller.
+    def __init__(self, fire_interval=0.25, use_slow_motion=True, bullet_speed=800):
+        self.fire_interval = fire_interval
+        self.use_slow_motion = use_slow_motion
+        self.bullet_speed = bullet_speed
+        self.next_shot = 0.0
+
+    def target(self, game):
+        enemies = game.enemies
+        n = enemies.count
+        if n == 0:
+            return None
+        # Only enemies already inside the corridor can be hit
+        best = None
+        best_y = 0
+        for x, y in zip(enemies.x[:n].tolist(), enemies.y[:n].tolist()):
+            if y > best_y:
+                best, best_y = x, y
+        if best is None:
+            return None
+
+        gun_x, gun_y = game.ship_x, game.ship_y - 20
+        flight_time = math.hypot(best - gun_x, best_y - gun_y) / self.bullet_speed
+        return int(best), int(best_y + game.corridor_speed * flight_time)
+
+    def __call__(self, game):
+        tick = TickInput(0, game.crosshair_x, game.crosshair_y)
+        if game.game_time >= self.next_shot:
+            target = self.target(game)
+            if target is not None:
+                tick.crosshair_x, tick.crosshair_y = target
+                tick.shots.append(target)
+                self.next_shot = game.game_time + self.fire_interval
+        if self.use_slow_motion and game.slow_motion_charge >= game.max_slow_motion:
+            tick.slow_motion = True
+        game.apply_input(tick)
+
+
+class RandomBot:
+    # Fires at uniformly random points at a fixed rate; a baseline for
+    # comparing against AimBot
+    def __init__(self, fire_interval=0.25, seed=None):
+        self.fire_interval = fire_interval
+        self.rng = random.Random(seed)
+        self.next_shot = 0.0
+
+    def __call__(self, game):
+        tick = TickInput(0, game.crosshair_x, game.crosshair_y)
+        if game.game_time >= self.next_shot:
+            target = (self.rng.randint(0, SCREEN_WIDTH), self.rng.randint(0, SCREEN_HEIGHT))
+            tick.crosshair_x, tick.crosshair_y = target
+            tick.shots.append(target)
+            self.next_shot = game.game_time + self.fire_interval
+        tick.slow_motion = game.slow_motion_charge >= game.max_slow_motion
+        game.apply_input(tick)
+
+
+# Bot factories by name, called with the game seed
+BOTS = {
+    "aim": lambda seed: AimBot(),
+    "random": lambda seed: RandomBot(seed=seed),
+}
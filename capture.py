@@ -0,0 +1,156 @@
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(rgb, level=1):
+    # Truecolor PNG of an (height, width, 3) uint8 array, every row
+    # unfiltered, in one IDAT chunk
+    height, width, _ = rgb.shape
+    rows = np.empty((height, 1 + width * 3), np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join((PNG_SIGNATURE, png_chunk(b"IHDR", header),
+                     png_chunk(b"IDAT", zlib.compress(rows, level)), png_chunk(b"IEND", b"")))
+
+
+def channel_order(surface):
+    # Byte offsets of red, green and blue within a 32-bit pixel of surface
+    offsets = [shift // 8 for shift in surface.get_shifts()[:3]]
+    if sys.byteorder == "big":
+        offsets = [3 - offset for offset in offsets]
+    return offsets
+
+
+class FrameCapture:
+    # Records the frames drawn by RailShooter.draw(). add() copies a frame
+    # out of the surface through a buffer view (one memcpy, no temporary
+    # arrays) into one of a ring of preallocated buffers and hands it to a
+    # pool of encoder threads. They convert it to RGB and either write it
+    # as frame_NNNNNN.png into the `path` directory or, for a path ending
+    # in .raw, pass it on to a writer thread that appends the frames in
+    # order to one rgb24 stream, e.g. for
+    #   ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r FPS -i PATH clip.mp4
+    # NumPy copies and zlib release the GIL, so encoding runs alongside the
+    # game.
+    #
+    # With wait=True, add() blocks while every buffer is still queued for
+    # encoding, so no frame is lost; offline exports want this. With
+    # wait=False the frame is dropped instead and counted in `dropped`, so
+    # live capture never holds up the game.
+    def __init__(self, path, workers=4, buffers=None, wait=True, level=1):
+        self.path = path
+        self.raw = path.endswith(".raw")
+        self.wait = wait
+        self.level = level
+        self.buffer_count = buffers or workers * 2
+        self.free = queue.Queue()
+        # Frame size and RGB byte offsets, taken from the first frame
+        self.size = None
+        self.channels = None
+        self.frames = 0
+        self.dropped = 0
+        self.error = None
+
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="capture")
+        self.stream = None
+        self.writer = None
+        if self.raw:
+            self.stream = open(path, "wb")
+            self.pending = queue.SimpleQueue()
+            self.writer = threading.Thread(target=self.write_loop, name="capture-writer",
+                                           daemon=True)
+            self.writer.start()
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def allocate(self, surface):
+        if surface.get_bytesize() != 4:
+            raise ValueError("frame capture needs a 32-bit surface")
+        width, height = self.size = surface.get_size()
+        self.channels = channel_order(surface)
+        for _ in range(self.buffer_count):
+            self.free.put(np.empty((height, width), np.uint32))
+
+    def add(self, surface):
+        # Queue one frame for encoding; returns False if it was dropped
+        if self.error is not None:
+            raise self.error
+        if self.size is None:
+            self.allocate(surface)
+        elif surface.get_size() != self.size:
+            raise ValueError(f"frame size {surface.get_size()} differs from {self.size}")
+        try:
+            buffer = self.free.get(self.wait)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        # The view is (width, height) and keeps the surface locked, so it
+        # only lives for the copy
+        np.copyto(buffer, np.asarray(surface.get_view("2")).T)
+        future = self.pool.submit(self.encode, buffer, self.frames)
+        future.add_done_callback(self.done)
+        if self.writer is not None:
+            self.pending.put(future)
+        self.frames += 1
+        return True
+
+    def encode(self, buffer, frame):
+        try:
+            pixels = buffer.view(np.uint8).reshape(buffer.shape + (4,))
+            rgb = np.empty(buffer.shape + (3,), np.uint8)
+            for i, channel in enumerate(self.channels):
+                rgb[:, :, i] = pixels[:, :, channel]
+        finally:
+            self.free.put(buffer)
+        if self.raw:
+            return rgb
+        with open(os.path.join(self.path, f"frame_{frame:06d}.png"), "wb") as f:
+            f.write(encode_png(rgb, self.level))
+        return None
+
+    def done(self, future):
+        if future.exception() is not None:
+            self.fail(future.exception())
+
+    def fail(self, error):
+        # Keep the first error; add() and close() raise it
+        if self.error is None:
+            self.error = error
+
+    def write_loop(self):
+        # Raw streams only: write the encoded frames in the order they came in
+        while True:
+            future = self.pending.get()
+            if future is None:
+                break
+            if future.exception() is not None:
+                continue
+            try:
+                self.stream.write(future.result())
+            except Exception as error:
+                self.fail(error)
+
+    def close(self):
+        # Wait until every queued frame is written
+        self.pool.shutdown(wait=True)
+        if self.writer is not None:
+            self.pending.put(None)
+            self.writer.join()
+            self.stream.close()
+        if self.error is not None:
+            raise self.error
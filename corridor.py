@@ -0,0 +1,113 @@
+import pygame
+
+
+class CorridorBackground:
+    # Pre-rendered perspective corridor. Lines are `spacing` px apart and
+    # every other one is a grid line, so the picture repeats every
+    # 2 * spacing px of scroll. Each whole-pixel phase in that period is
+    # rasterized once into a colorkeyed, RLE-accelerated frame (only the
+    # line pixels are stored), and drawing the background is one blit.
+    # Geometry is in logical pixels; frames are rasterized `scale` times
+    # larger, and their dirty rects are in those scaled pixels.
+    def __init__(self, width, height, spacing=50, phase_step=1, scale=1.0):
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.period = spacing * 2
+        self.phase_step = phase_step
+        self.scale = scale
+        self.frames = {}
+        # Bounding boxes of the drawn lines, per frame, for dirty-rect redraws
+        self.frame_rects = {}
+        # Simplified look: only the two side walls, as one static frame
+        self.simple = False
+        self.walls = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def phase_key(self, phase):
+        return int(phase % self.period) // self.phase_step * self.phase_step
+
+    def line_positions(self, phase):
+        # (index, y) of every line near the screen; even indices are grid lines
+        first = -int(phase // self.spacing) - 1
+        last = first + self.height // self.spacing + 3
+        return [(j, phase + j * self.spacing) for j in range(first, last)]
+
+    def edges(self, y):
+        # Perspective scaling: the corridor narrows towards the top
+        scale = (y + 100) / (self.height + 100)
+        width = int(self.width * scale)
+        left_x = (self.width - width) // 2
+        return left_x, left_x + width, scale
+
+    def new_frame(self):
+        scale = self.scale
+        surface = pygame.Surface((round(self.width * scale), round(self.height * scale)))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def render_frame(self, phase):
+        rects = []
+        surface = self.new_frame()
+        s = self.scale
+
+        prev_y = None
+        for j, y in self.line_positions(phase):
+            if not 0 <= y <= self.height:
+                prev_y = None
+                continue
+            left_x, right_x, scale = self.edges(y)
+            color_intensity = int(100 * scale)
+            color = (color_intensity, color_intensity, color_intensity)
+
+            if j % 2 == 0:  # Grid lines
+                rects.append(pygame.draw.line(surface, color, (left_x * s, y * s),
+                                              (right_x * s, y * s), 2))
+
+            # Side walls back to the previous line
+            if prev_y is not None:
+                prev_left, prev_right, _ = self.edges(prev_y)
+                rects.append(pygame.draw.line(surface, color, (left_x * s, y * s),
+                                              (prev_left * s, prev_y * s), 1))
+                rects.append(pygame.draw.line(surface, color, (right_x * s, y * s),
+                                              (prev_right * s, prev_y * s), 1))
+            prev_y = y
+
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surface, rects
+
+    def render_walls(self):
+        surface = self.new_frame()
+        s = self.scale
+        top_left, top_right, _ = self.edges(0)
+        bottom_left, bottom_right, _ = self.edges(self.height)
+        bottom = self.height * s
+        pygame.draw.line(surface, (64, 64, 64), (top_left * s, 0), (bottom_left * s, bottom), 1)
+        pygame.draw.line(surface, (64, 64, 64), (top_right * s, 0), (bottom_right * s, bottom), 1)
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surface
+
+    def frame(self, phase):
+        if self.simple:
+            if self.walls is None:
+                self.walls = self.render_walls()
+            return self.walls
+        key = self.phase_key(phase)
+        surface = self.frames.get(key)
+        if surface is None:
+            surface, self.frame_rects[key] = self.render_frame(key)
+            self.frames[key] = surface
+        return surface
+
+    def dirty_rects(self, phase):
+        # The simple frame never moves, so it never dirties anything
+        if self.simple:
+            return ()
+        self.frame(phase)
+        return self.frame_rects[self.phase_key(phase)]
+
+    def draw(self, screen, phase):
+        screen.blit(self.frame(phase), (0, 0))
@@ -0,0 +1,59 @@
+import numpy as np
+import pygame
+
+
+class DirtyRectRenderer:
+    # Opt-in partial redraw. Each frame the caller passes the bounding boxes
+    # of everything it is about to draw. Those plus the previous frame's
+    # boxes are the only areas that can change: they are cleared before
+    # drawing and sent to pygame.display.update() instead of a full flip.
+    def __init__(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.previous = []
+        self.rects = []
+        self.invalidate()
+
+    def invalidate(self):
+        # Force the next frame to repaint the whole screen
+        self.previous = [self.screen_rect.copy()]
+
+    def begin(self, rects):
+        current = []
+        screen_rect = self.screen_rect
+        for rect in rects:
+            rect = screen_rect.clip(rect)
+            if rect.width and rect.height:
+                current.append(rect)
+        self.rects = self.previous + current
+        self.previous = current
+        return self.rects
+
+    def clear(self, screen, color):
+        for rect in self.rects:
+            screen.fill(color, rect)
+
+    def present(self):
+        pygame.display.update(self.rects)
+
+
+def tile_rects(xs, ys, half, tile=32):
+    # Cover many small boxes (centre +/- half) with the tiles they touch.
+    # Much cheaper than one rect per box for dense sets such as particles.
+    if len(xs) == 0:
+        return []
+    x0 = ((xs - half) // tile).astype(np.int64)
+    x1 = ((xs + half) // tile).astype(np.int64)
+    y0 = ((ys - half) // tile).astype(np.int64)
+    y1 = ((ys + half) // tile).astype(np.int64)
+    # A box no larger than a tile touches at most its four corner tiles
+    cols = np.concatenate((x0, x1, x0, x1))
+    rows = np.concatenate((y0, y0, y1, y1))
+    cells = np.unique(np.stack((rows, cols), axis=1), axis=0)
+    return [(col * tile, row * tile, tile, tile) for row, col in cells.tolist()]
+
+
+def scale_rects(rects, scale):
+    # (x, y, width, height) boxes from logical to render pixels, grown to
+    # whole pixels on every side
+    return [(int(x * scale) - 1, int(y * scale) - 1, int(width * scale) + 3, int(height * scale) + 3)
+            for x, y, width, height in rects]
@@ -0,0 +1,180 @@
+import numpy as np
+
+from batch import EntityBatch
+
+
+class Component:
+    # A named group of columns. Tables (archetypes) are built from a list of
+    # components, and systems pick the tables that carry the components they
+    # work on; a component without columns is a plain tag.
+    def __init__(self, name, **columns):
+        self.name = name
+        self.columns = columns
+
+    def __repr__(self):
+        return f"Component({self.name!r})"
+
+
+POSITION = Component("position", x=np.float64, y=np.float64,
+                     prev_x=np.float64, prev_y=np.float64)
+VELOCITY = Component("velocity", velocity_x=np.float64, velocity_y=np.float64)
+LIFETIME = Component("lifetime", lifetime=np.float64, max_lifetime=np.float64)
+HEALTH = Component("health", health=np.int16, max_health=np.int16, hit_flash=np.float64)
+COLLIDER = Component("collider", size=np.float64)
+SWAY = Component("sway", speed=np.float64, angle=np.float64, movement_timer=np.float64)
+PULSE = Component("pulse", pulse_timer=np.float64)
+# Carried along by the corridor scroll
+SCROLL = Component("scroll")
+# Drawn by the game's render system
+RENDER = Component("render")
+
+
+def archetype(*components, **columns):
+    # Column layout of a table: every component's columns, any table-specific
+    # extras, and the active flag
+    fields = {}
+    for component in components:
+        fields.update(component.columns)
+    fields.update(columns)
+    fields["active"] = np.bool_
+    return fields
+
+
+class Table(EntityBatch):
+    # EntityBatch whose columns come from components. Rows are entities;
+    # a row index is the entity's id until the end-of-tick compaction.
+    # `bounds` is the (min_x, min_y, max_x, max_y) box outside of which
+    # entities are culled, or None to never cull. Tables with RENDER also
+    # define draw(screen, sprites, alpha, scale, settings).
+    components = ()
+    bounds = None
+    # Draw order of RENDER tables, lowest first
+    layer = 0
+
+    def has(self, *components):
+        return all(component in self.components for component in components)
+
+
+class World:
+    # All entity tables by name, plus component queries over them. Query
+    # results and the draw order are cached until the next table is added.
+    def __init__(self):
+        self.tables = {}
+        self.queries = {}
+        self.render_tables = None
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def add(self, name, table):
+        self.tables[name] = table
+        self.queries.clear()
+        self.render_tables = None
+        return table
+
+    def query(self, *components):
+        tables = self.queries.get(components)
+        if tables is None:
+            tables = self.queries[components] = [
+                table for table in self.tables.values() if table.has(*components)]
+        return tables
+
+    def render_order(self):
+        # (name, table) of every drawable table, lowest layer first
+        order = self.render_tables
+        if order is None:
+            order = self.render_tables = sorted(
+                ((name, table) for name, table in self.tables.items()
+                 if table.has(POSITION, RENDER)),
+                key=lambda item: item[1].layer)
+        return order
+
+    def counts(self):
+        return {name: len(table) for name, table in self.tables.items()}
+
+    def compact(self):
+        for table in self.tables.values():
+            table.remove_inactive()
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+
+
+# Systems. Each one runs over whole columns of every table that has the
+# components it needs.
+
+def store_previous(world):
+    # Remember this tick's starting positions for swept collisions and
+    # interpolated drawing
+    for table in world.query(POSITION):
+        n = table.count
+        if n == 0:
+            continue
+        table.prev_x[:n] = table.x[:n]
+        table.prev_y[:n] = table.y[:n]
+
+
+def integrate(world, dt):
+    for table in world.query(POSITION, VELOCITY):
+        n = table.count
+        if n == 0:
+            continue
+        table.x[:n] += table.velocity_x[:n] * dt
+        table.y[:n] += table.velocity_y[:n] * dt
+
+
+def scroll(world, dt, speed):
+    for table in world.query(POSITION, SCROLL):
+        if table.count:
+            table.y[:table.count] += speed * dt
+
+
+def sway(world, dt, width):
+    # Side-to-side drift, kept on screen horizontally
+    for table in world.query(POSITION, SWAY, COLLIDER):
+        n = table.count
+        if n == 0:
+            continue
+        x = table.x[:n]
+        size = table.size[:n]
+        movement_timer = table.movement_timer[:n]
+        movement_timer += dt
+        x += np.sin(movement_timer * 2) * table.speed[:n] * dt * 0.5
+        np.clip(x, size, width - size, out=x)
+
+
+def pulse(world, dt):
+    for table in world.query(PULSE):
+        if table.count:
+            table.pulse_timer[:table.count] += dt
+
+
+def decay_flash(world, dt):
+    for table in world.query(HEALTH):
+        if table.count == 0:
+            continue
+        hit_flash = table.hit_flash[:table.count]
+        np.subtract(hit_flash, dt, out=hit_flash, where=hit_flash > 0)
+
+
+def age(world, dt):
+    for table in world.query(LIFETIME):
+        n = table.count
+        if n == 0:
+            continue
+        lifetime = table.lifetime[:n]
+        lifetime -= dt
+        table.active[:n] &= lifetime > 0
+
+
+def cull(world):
+    for table in world.query(POSITION):
+        n = table.count
+        if n == 0 or table.bounds is None:
+            continue
+        x = table.x[:n]
+        y = table.y[:n]
+        min_x, min_y, max_x, max_y = table.bounds
+        table.active[:n] &= (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+
@@ -0,0 +1,128 @@
+import struct
+import zlib
+from collections import deque
+
+# Input log file layout (little endian):
+#   header   magic, version, seed, tick count, final score, final state digest
+#   payload  zlib-compressed ticks, each a TICK record followed by
+#            n_shots SHOT records
+MAGIC = b"RSIL"
+VERSION = 1
+HEADER = struct.Struct("<4sHQIq20s")
+TICK = struct.Struct("<HhhBB")
+SHOT = struct.Struct("<hh")
+
+FLAG_SLOW_MOTION = 1
+FLAG_RESET = 2
+
+# Kinds of queued input events
+AIM = 0
+SHOOT = 1
+SLOW_MOTION = 2
+RESET = 3
+
+
+class TickInput:
+    # Everything the player did during one tick of the game loop
+    __slots__ = ("dt_ms", "crosshair_x", "crosshair_y", "shots", "slow_motion", "reset")
+
+    def __init__(self, dt_ms, crosshair_x, crosshair_y, shots=(), slow_motion=False, reset=False):
+        self.dt_ms = dt_ms
+        self.crosshair_x = crosshair_x
+        self.crosshair_y = crosshair_y
+        self.shots = list(shots)
+        self.slow_motion = slow_motion
+        self.reset = reset
+
+
+class InputQueue:
+    # Timestamped input events waiting for the simulation. The event loop
+    # pushes them as they arrive; each tick then takes everything stamped
+    # before the end of its time slice, so an event lands in the tick it
+    # happened in rather than whichever tick happens to run next.
+    def __init__(self):
+        self.events = deque()
+
+    def __len__(self):
+        return len(self.events)
+
+    def push(self, timestamp, kind, value=None):
+        self.events.append((timestamp, kind, value))
+
+    def take(self, until, tick):
+        # Fold the events stamped before `until` into tick
+        events = self.events
+        while events and events[0][0] < until:
+            _, kind, value = events.popleft()
+            if kind == AIM:
+                tick.crosshair_x, tick.crosshair_y = value
+            elif kind == SHOOT:
+                tick.shots.append(value)
+            elif kind == SLOW_MOTION:
+                tick.slow_motion = True
+            elif kind == RESET:
+                tick.reset = True
+        return tick
+
+
+class InputLog:
+    # Compact per-tick input recording for one seeded session, plus the
+    # final score and state digest a replay has to reproduce
+    def __init__(self, seed, ticks=None, final_score=0, final_digest=b"\0" * 20):
+        self.seed = seed
+        self.ticks = ticks if ticks is not None else []
+        self.final_score = final_score
+        self.final_digest = final_digest
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def append(self, tick):
+        self.ticks.append(tick)
+
+    def finish(self, score, digest):
+        self.final_score = score
+        self.final_digest = digest
+
+    def to_bytes(self):
+        parts = []
+        for tick in self.ticks:
+            flags = (FLAG_SLOW_MOTION if tick.slow_motion else 0) | (FLAG_RESET if tick.reset else 0)
+            parts.append(TICK.pack(tick.dt_ms, tick.crosshair_x, tick.crosshair_y,
+                                   len(tick.shots), flags))
+            for x, y in tick.shots:
+                parts.append(SHOT.pack(x, y))
+        header = HEADER.pack(MAGIC, VERSION, self.seed, len(self.ticks),
+                             self.final_score, self.final_digest)
+        return header + zlib.compress(b"".join(parts), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, count, final_score, final_digest = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a Rail Shooter input log")
+        if version != VERSION:
+            raise ValueError(f"unsupported input log version {version}")
+
+        payload = zlib.decompress(data[HEADER.size:])
+        ticks = []
+        offset = 0
+        for _ in range(count):
+            dt_ms, x, y, n_shots, flags = TICK.unpack_from(payload, offset)
+            offset += TICK.size
+            shots = []
+            for _ in range(n_shots):
+                shots.append(SHOT.unpack_from(payload, offset))
+                offset += SHOT.size
+            ticks.append(TickInput(dt_ms, x, y, shots,
+                                   bool(flags & FLAG_SLOW_MOTION), bool(flags & FLAG_RESET)))
+        return cls(seed, ticks, final_score, final_digest)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
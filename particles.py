@@ -0,0 +1,105 @@
+import numpy as np
+import pygame
+
+from ecs import LIFETIME, POSITION, RENDER, VELOCITY, Table, archetype
+
+
+class ParticleSystem(Table):
+    # Particle table: moved by the integrate system and expired by the age
+    # system like any other entity. At most `limit` particles are alive at
+    # once; emits beyond that are dropped.
+    MAX_SIZE = 4
+    components = (POSITION, VELOCITY, LIFETIME, RENDER)
+    # Drawn behind every other entity
+    layer = 0
+    fields = archetype(*components, color=np.uint8)
+
+    def __init__(self, limit=16384, seed=None):
+        super().__init__(capacity=1024)
+        self.limit = limit
+        self.rng = np.random.default_rng(seed)
+
+        # Colors are stored as indices into a small palette
+        self.palette = []
+        self.palette_index = {}
+        self.stamps = []
+        self.stamp_scale = 1.0
+
+    def snapshot(self):
+        # Palette as RGB triples, then the table's columns
+        palette = bytes(channel for color in self.palette for channel in color)
+        return len(self.palette).to_bytes(1, "little") + palette + super().snapshot()
+
+    def restore(self, count, data):
+        colors = data[0]
+        palette = [tuple(data[1 + i * 3:4 + i * 3]) for i in range(colors)]
+        if palette != self.palette:
+            # Stamps are indexed by palette position, so only a different
+            # palette needs them rebuilt
+            self.palette = palette
+            self.palette_index = {color: i for i, color in enumerate(palette)}
+            self.stamps = []
+        super().restore(count, data[1 + colors * 3:])
+
+    def color_id(self, color):
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def emit(self, x, y, color, count, speed=200, min_lifetime=0.5, max_lifetime=1.5):
+        count = min(count, self.limit - self.count)
+        if count <= 0:
+            return
+        velocity = self.rng.uniform(-speed, speed, (count, 2))
+        lifetime = self.rng.uniform(min_lifetime, max_lifetime, count)
+        self.extend(count, x=x, y=y, prev_x=x, prev_y=y,
+                    velocity_x=velocity[:, 0], velocity_y=velocity[:, 1],
+                    lifetime=lifetime, max_lifetime=lifetime,
+                    color=self.color_id(color), active=True)
+
+    def stamp_radii(self, scale):
+        # Radius in pixels of each logical size at the given render scale
+        radii = [0] + [max(1, round(size * scale)) for size in range(1, self.MAX_SIZE + 1)]
+        return np.array(radii, dtype=np.int32)
+
+    def build_stamps(self, scale=1.0):
+        # One pre-rendered circle per (color, size), indexed by
+        # color_id * (MAX_SIZE + 1) + size
+        self.stamps = []
+        self.stamp_scale = scale
+        for color in self.palette:
+            for radius in self.stamp_radii(scale).tolist():
+                stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+                stamp.set_colorkey((0, 0, 0))
+                if radius > 0:
+                    pygame.draw.circle(stamp, color, (radius, radius), radius)
+                self.stamps.append(stamp)
+
+    def draw(self, screen, sprites, alpha, scale, settings):
+        # Drawn from the particle system's own stamps rather than the sprite
+        # cache
+        n = self.count
+        if (len(self.stamps) < len(self.palette) * (self.MAX_SIZE + 1)
+                or self.stamp_scale != scale):
+            self.build_stamps(scale)
+
+        # Particles shrink from MAX_SIZE to 1 pixel over their lifetime
+        ratio = self.lifetime[:n] / self.max_lifetime[:n]
+        size = np.maximum(1, (self.MAX_SIZE * ratio).astype(np.int32))
+        stamp_ids = self.color[:n].astype(np.int32) * (self.MAX_SIZE + 1) + size
+        x, y = self.interpolate(alpha)
+        if scale != 1.0:
+            x = x * scale
+            y = y * scale
+            size = self.stamp_radii(scale)[size]
+        left = (x.astype(np.int32) - size).tolist()
+        top = (y.astype(np.int32) - size).tolist()
+
+        stamps = self.stamps
+        screen.blits(
+            [(stamps[s], (l, t)) for s, l, t in zip(stamp_ids.tolist(), left, top)],
+            doreturn=False,
+        )
@@ -0,0 +1,175 @@
+import csv
+import gc
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+
+class FrameProfiler:
+    # Per-frame timing for the game loop. Code calls lap(name) at the end of
+    # each stage, which charges the time since the previous lap to that stage;
+    # end_frame() folds the frame into rolling windows (for percentiles and
+    # the overlay) and into the session log (for CSV/JSON export).
+    def __init__(self, window=600, keep_session=True):
+        self.window = window
+        self.keep_session = keep_session
+        self.stages = []
+        self.history = {}
+        self.frame = {}
+        self.frame_start = time.perf_counter()
+        self.last = self.frame_start
+        self.frame_count = 0
+        self.counts = {}
+
+        # Session log: one row per frame
+        self.rows = []
+
+        # Garbage collector pauses, measured through gc.callbacks
+        self.gc_pauses = 0
+        self.gc_pause_ms = 0.0
+        self.frame_gc_pauses = 0
+        self.gc_start = None
+        self.tracking_gc = False
+
+    def close(self):
+        if self.tracking_gc:
+            gc.callbacks.remove(self.on_gc)
+            self.tracking_gc = False
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+        elif self.gc_start is not None:
+            self.gc_pause_ms += (time.perf_counter() - self.gc_start) * 1000
+            self.gc_pauses += 1
+            self.frame_gc_pauses += 1
+            self.gc_start = None
+
+    def begin_frame(self):
+        # GC tracking starts with the first real frame, so headless games
+        # that never call begin_frame() leave gc.callbacks alone
+        if not self.tracking_gc:
+            gc.callbacks.append(self.on_gc)
+            self.tracking_gc = True
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.frame[name] = self.frame.get(name, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self, counts=None):
+        now = time.perf_counter()
+        frame = self.frame
+        frame["frame"] = (now - self.frame_start) * 1000
+        for name, ms in frame.items():
+            history = self.history.get(name)
+            if history is None:
+                history = self.history[name] = deque(maxlen=self.window)
+                self.stages.append(name)
+            history.append(ms)
+        if counts:
+            self.counts = counts
+
+        if self.keep_session:
+            row = {"frame_index": self.frame_count, "gc_pauses": self.frame_gc_pauses}
+            row.update(frame)
+            row.update(self.counts)
+            self.rows.append(row)
+
+        self.frame_count += 1
+        self.frame_gc_pauses = 0
+        self.frame = {}
+        self.frame_start = self.last = now
+
+    def percentiles(self, name):
+        history = self.history.get(name)
+        if not history:
+            return (0.0, 0.0, 0.0)
+        return tuple(np.percentile(np.fromiter(history, dtype=np.float64), (50, 95, 99)))
+
+    def summary(self):
+        return {
+            "frames": self.frame_count,
+            "stages": {
+                name: dict(zip(("p50", "p95", "p99"), self.percentiles(name)))
+                for name in self.stages
+            },
+            "counts": dict(self.counts),
+            "gc_pauses": self.gc_pauses,
+            "gc_pause_ms": self.gc_pause_ms,
+        }
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_csv(self, path):
+        columns = ["frame_index", "gc_pauses"]
+        for row in self.rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval="")
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+class ProfilerOverlay:
+    # On-screen table of stage percentiles, entity counts and GC pauses.
+    # The panel is re-rendered every `refresh` frames and blitted in between.
+    def __init__(self, profiler, refresh=30, position=(20, 130)):
+        self.profiler = profiler
+        # Loaded on first use so the overlay costs nothing until shown
+        self.font = None
+        self.refresh = refresh
+        self.position = position
+        self.visible = False
+        self.panel = None
+        self.rendered_at = -refresh
+
+    def toggle(self):
+        # The font lookup can be slow, so it finishes before the overlay
+        # shows up
+        if not self.visible and self.font is None:
+            self.font = pygame.font.SysFont("monospace", 15)
+        self.panel = None
+        self.visible = not self.visible
+
+    def rect(self):
+        if self.panel is None:
+            return pygame.Rect(self.position, (0, 0))
+        return self.panel.get_rect(topleft=self.position)
+
+    def render_panel(self):
+        profiler = self.profiler
+        lines = [f"{'stage':<18}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name in profiler.stages:
+            p50, p95, p99 = profiler.percentiles(name)
+            lines.append(f"{name:<18}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        counts = "  ".join(f"{key}={value}" for key, value in profiler.counts.items())
+        lines.append(counts)
+        lines.append(f"gc pauses={profiler.gc_pauses} ({profiler.gc_pause_ms:.1f} ms)")
+
+        line_height = self.font.get_linesize()
+        surfaces = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 12
+        panel = pygame.Surface((width, line_height * len(lines) + 12))
+        panel.fill((20, 20, 20))
+        panel.set_alpha(200)
+        for i, surface in enumerate(surfaces):
+            panel.blit(surface, (6, 6 + i * line_height))
+        return panel
+
+    def draw(self, screen):
+        if not self.visible:
+            return
+        frame_count = self.profiler.frame_count
+        if self.panel is None or frame_count - self.rendered_at >= self.refresh:
+            self.panel = self.render_panel()
+            self.rendered_at = frame_count
+        screen.blit(self.panel, self.position)
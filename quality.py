@@ -0,0 +1,90 @@
+from collections import deque
+
+
+class QualityLevel:
+    # Visual settings for one step of the quality ladder
+    def __init__(self, name, explosion_particles, bullet_glow, enemy_outlines,
+                 simple_corridor, particle_cap):
+        self.name = name
+        self.explosion_particles = explosion_particles
+        self.bullet_glow = bullet_glow
+        self.enemy_outlines = enemy_outlines
+        self.simple_corridor = simple_corridor
+        # Most particles alive at once, or None for the particle system's own limit
+        self.particle_cap = particle_cap
+
+    def __repr__(self):
+        return f"QualityLevel({self.name!r})"
+
+
+# From full detail down; each level sheds a little more than the one before
+LEVELS = (
+    QualityLevel("high", 15, True, True, False, None),
+    QualityLevel("fewer-particles", 8, True, True, False, None),
+    QualityLevel("flat-sprites", 8, False, False, False, None),
+    QualityLevel("simple-corridor", 5, False, False, True, None),
+    QualityLevel("particle-cap", 5, False, False, True, 512),
+)
+
+
+class QualityDecision:
+    def __init__(self, frame, old_level, new_level, frame_ms):
+        self.frame = frame
+        self.old_level = old_level
+        self.new_level = new_level
+        # Average frame time that triggered the change
+        self.frame_ms = frame_ms
+
+    def __repr__(self):
+        return (f"QualityDecision(frame={self.frame}, {LEVELS[self.old_level].name} -> "
+                f"{LEVELS[self.new_level].name}, {self.frame_ms:.2f} ms)")
+
+
+class QualityScaler:
+    # Picks a quality level from measured frame times. Frame times are the
+    # work done per frame (update and draw, not the wait for the next
+    # frame). Quality drops one level once the average over `window`
+    # frames goes over budget_ms * degrade_above, and comes back one level
+    # only after restore_frames frames in a row under budget_ms *
+    # restore_below. The gap between the two thresholds and the longer
+    # wait to restore keep it from flipping back and forth; after every
+    # change the window starts over.
+    def __init__(self, budget_ms, window=30, degrade_above=0.9, restore_below=0.6,
+                 restore_frames=120, history=64):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.degrade_above = degrade_above
+        self.restore_below = restore_below
+        self.restore_frames = restore_frames
+        self.level = 0
+        self.frames = 0
+        self.recent = deque(maxlen=window)
+        self.headroom_frames = 0
+        # Most recent changes, oldest first
+        self.decisions = deque(maxlen=history)
+
+    def observe(self, frame_ms):
+        # Feed one frame's time; returns True when the level changed
+        self.frames += 1
+        recent = self.recent
+        recent.append(frame_ms)
+        if frame_ms < self.budget_ms * self.restore_below:
+            self.headroom_frames += 1
+        else:
+            self.headroom_frames = 0
+        if len(recent) < self.window:
+            return False
+
+        average = sum(recent) / len(recent)
+        if average > self.budget_ms * self.degrade_above and self.level < len(LEVELS) - 1:
+            return self.change(self.level + 1, average)
+        if self.headroom_frames >= self.restore_frames and self.level > 0:
+            return self.change(self.level - 1, average)
+        return False
+
+    def change(self, level, frame_ms):
+        self.decisions.append(QualityDecision(self.frames, self.level, level, frame_ms))
+        self.level = level
+        self.recent.clear()
+        self.headroom_frames = 0
+        return True
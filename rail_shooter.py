@@ -1,17 +1,55 @@
 import pygame
+import argparse
+import hashlib
 import math
 import random
+import struct
+import sys
+import threading
 import time
+from collections import deque
 from enum import Enum
 
-# Initialize Pygame
-pygame.init()
+import numpy as np
+
+from capture import FrameCapture
+from corridor import CorridorBackground
+from dirty import DirtyRectRenderer, scale_rects, tile_rects
+from ecs import (COLLIDER, HEALTH, POSITION, PULSE, RENDER, SCROLL, SWAY, VELOCITY, Table, World,
+                 age, archetype, cull, decay_flash, integrate, pulse, scroll, store_previous,
+                 sway)
+from inputs import AIM, RESET, SHOOT, SLOW_MOTION, InputLog, InputQueue, TickInput
+from collision import grid_pairs, swept_contact
+from particles import ParticleSystem
+from profiler import FrameProfiler, ProfilerOverlay
+from quality import LEVELS, QualityScaler
+from snapshot import load_state, save_state
+from sprites import SpriteCache, blit_sequence, scaled_width
+from telemetry import ENEMY_SPAWN, KILL, PICKUP, POWER_UP_SPAWN, QUALITY, SCORE, SHIELD_HIT
+from telemetry import SLOW_MOTION as EVENT_SLOW_MOTION
+from telemetry import TelemetryLog
+from text import TextCache
+from waves import SPAWN_ENEMY, SPAWN_POWER_UP, SpawnScheduler
+
+# Nothing is initialized at import. Only the display and font subsystems
+# are ever started, by RailShooter.open_display() on the first frame.
 
 # Constants
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 FPS = 60
 
+# The simulation advances in fixed ticks of TICK_MS, independent of the
+# render rate. A frame runs at most MAX_TICKS_PER_FRAME ticks; time beyond
+# that is dropped so a slow machine slows the game down instead of spiralling.
+TICK_MS = 10
+MAX_TICKS_PER_FRAME = 5
+
+# How often the simulation thread of run_pipelined() checks for due ticks
+# and key commands, and the GIL switch interval it runs with, in seconds
+SIMULATION_POLL_INTERVAL = 0.001
+PIPELINED_SWITCH_INTERVAL = 0.001
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -30,168 +68,309 @@ class GameState(Enum):
     SLOW_MOTION = 2
     GAME_OVER = 3
 
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        
-    def update(self, dt):
-        self.x += self.velocity[0] * dt
-        self.y += self.velocity[1] * dt
-        self.lifetime -= dt
-        
-    def draw(self, screen):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            color_with_alpha = (*self.color, alpha)
-            size = max(1, int(4 * (self.lifetime / self.max_lifetime)))
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
+# Sprite renderers for SpriteCache. Each returns (surface, anchor) with the
+# shape drawn around the anchor pixel on a black (colorkeyed) background,
+# `scale` times its logical size.
+def render_enemy_sprite(size, color, outline=True, scale=1.0):
+    r = round(size * scale)
+    surface = pygame.Surface((r * 2 + 1, r * 2 + 1))
+    pygame.draw.circle(surface, color, (r, r), r)
+    if outline:
+        pygame.draw.circle(surface, WHITE, (r, r), r, scaled_width(2, scale))
+    return surface, (r, r)
 
-class Bullet:
-    def __init__(self, x, y, target_x, target_y):
-        self.x = x
-        self.y = y
-        self.speed = 800
-        
+def render_power_up_sprite(size, scale=1.0):
+    r = round(size * scale)
+    surface = pygame.Surface((r * 2 + 1, r * 2 + 1))
+    pygame.draw.circle(surface, YELLOW, (r, r), r)
+    pygame.draw.circle(surface, WHITE, (r, r), r, scaled_width(2, scale))
+    
+    # Inner star
+    points = []
+    for i in range(8):
+        angle = i * math.pi / 4
+        if i % 2 == 0:
+            star_r = r * 0.6
+        else:
+            star_r = r * 0.3
+        points.append((r + math.cos(angle) * star_r, r + math.sin(angle) * star_r))
+    pygame.draw.polygon(surface, YELLOW, points)
+    return surface, (r, r)
+
+def render_bullet_sprite(glow=True, scale=1.0):
+    c = round(6 * scale)
+    surface = pygame.Surface((c * 2 + 1, c * 2 + 1))
+    pygame.draw.circle(surface, CYAN, (c, c), max(1, round(3 * scale)))
+    if glow:
+        pygame.draw.circle(surface, (0, 100, 100), (c, c), c, scaled_width(1, scale))
+    return surface, (c, c)
+
+def render_ship_sprite(scale=1.0):
+    cx, cy = round(17 * scale), round(22 * scale)
+    surface = pygame.Surface((cx * 2 + 1, cy * 2 + 1))
+    ship_points = [
+        (cx, cy - 20 * scale),
+        (cx - 15 * scale, cy + 10 * scale),
+        (cx, cy + 5 * scale),
+        (cx + 15 * scale, cy + 10 * scale)
+    ]
+    pygame.draw.polygon(surface, CYAN, ship_points)
+    pygame.draw.polygon(surface, WHITE, ship_points, scaled_width(2, scale))
+    
+    # Engine glow
+    glow_points = [
+        (cx - 8 * scale, cy + 10 * scale),
+        (cx, cy + 20 * scale),
+        (cx + 8 * scale, cy + 10 * scale)
+    ]
+    pygame.draw.polygon(surface, ORANGE, glow_points)
+    return surface, (cx, cy)
+
+class BulletBatch(Table):
+    components = (POSITION, VELOCITY, RENDER)
+    fields = archetype(*components)
+    # Dropped once they leave the screen
+    bounds = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    layer = 3
+    speed = 800
+    
+    def spawn(self, x, y, target_x, target_y):
         # Calculate direction to target
         dx = target_x - x
         dy = target_y - y
         distance = math.sqrt(dx*dx + dy*dy)
         
         if distance > 0:
-            self.velocity_x = (dx / distance) * self.speed
-            self.velocity_y = (dy / distance) * self.speed
+            velocity_x = (dx / distance) * self.speed
+            velocity_y = (dy / distance) * self.speed
         else:
-            self.velocity_x = 0
-            self.velocity_y = -self.speed
+            velocity_x = 0
+            velocity_y = -self.speed
             
-        self.active = True
+        return self.add(x=x, y=y, prev_x=x, prev_y=y,
+                        velocity_x=velocity_x, velocity_y=velocity_y, active=True)
         
-    def update(self, dt):
-        if self.active:
-            self.x += self.velocity_x * dt
-            self.y += self.velocity_y * dt
-            
-            # Remove bullet if it goes off screen
-            if (self.x < 0 or self.x > SCREEN_WIDTH or 
-                self.y < 0 or self.y > SCREEN_HEIGHT):
-                self.active = False
-                
-    def draw(self, screen):
-        if self.active:
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), 3)
-            # Add glow effect
-            pygame.draw.circle(screen, (0, 100, 100), (int(self.x), int(self.y)), 6, 1)
+    def swept_boxes(self):
+        # Bounds of each bullet's path over the last tick
+        n = self.count
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        x1, y1 = self.x[:n], self.y[:n]
+        return np.minimum(x0, x1), np.minimum(y0, y1), np.maximum(x0, x1), np.maximum(y0, y1)
+        
+    def draw(self, screen, sprites, alpha, scale, settings):
+        glow = settings.bullet_glow
+        entry = sprites.get(("bullet", glow), render_bullet_sprite, glow)
+        x, y = self.interpolate(alpha)
+        if scale != 1.0:
+            x = x * scale
+            y = y * scale
+        positions = zip(x.astype(np.int32).tolist(), y.astype(np.int32).tolist())
+        screen.blits(blit_sequence(entry, positions), doreturn=False)
 
-class Enemy:
-    def __init__(self, x, y, enemy_type="normal"):
-        self.x = x
-        self.y = y
-        self.type = enemy_type
-        self.health = 3 if enemy_type == "special" else 1
-        self.max_health = self.health
-        self.size = 25 if enemy_type == "special" else 15
-        self.speed = 50 if enemy_type == "special" else 100
-        self.active = True
-        self.hit_flash = 0
-        
-        # Movement pattern
-        self.angle = random.uniform(0, 2 * math.pi)
-        self.movement_timer = 0
-        
-    def update(self, dt, corridor_speed):
-        if self.active:
-            # Move towards player (simulating corridor movement)
-            self.y += corridor_speed * dt
-            
-            # Add some side-to-side movement
-            self.movement_timer += dt
-            self.x += math.sin(self.movement_timer * 2) * self.speed * dt * 0.5
-            
-            # Keep enemy on screen horizontally
-            self.x = max(self.size, min(SCREEN_WIDTH - self.size, self.x))
-            
-            # Remove if off screen
-            if self.y > SCREEN_HEIGHT + 50:
-                self.active = False
-                
-            # Update hit flash
-            if self.hit_flash > 0:
-                self.hit_flash -= dt
-                
-    def take_damage(self):
-        self.health -= 1
-        self.hit_flash = 0.2
-        if self.health <= 0:
-            self.active = False
+# Enemy types, indexed by the type id stored in EnemyBatch.type. A new kind
+# of enemy is one more row here; wave files refer to types by name.
+ENEMY_TYPES = (
+    # name, health, size, sway speed, color, points, kill gives slow motion charge
+    ("normal", 1, 15, 100, RED, 50, False),
+    ("special", 3, 25, 50, PURPLE, 100, True),
+)
+ENEMY_TYPE_IDS = {name: i for i, (name, *_) in enumerate(ENEMY_TYPES)}
+ENEMY_HEALTH = np.array([row[1] for row in ENEMY_TYPES])
+ENEMY_SIZE = np.array([row[2] for row in ENEMY_TYPES], dtype=np.float64)
+ENEMY_SPEED = np.array([row[3] for row in ENEMY_TYPES], dtype=np.float64)
+ENEMY_COLORS = [row[4] for row in ENEMY_TYPES]
+ENEMY_POINTS = [row[5] for row in ENEMY_TYPES]
+ENEMY_CHARGES = [row[6] for row in ENEMY_TYPES]
+
+class EnemyBatch(Table):
+    components = (POSITION, SCROLL, SWAY, COLLIDER, HEALTH, RENDER)
+    fields = archetype(*components, type=np.uint8)
+    # Removed once they scroll off the bottom of the screen
+    bounds = (-np.inf, -np.inf, np.inf, SCREEN_HEIGHT + 50)
+    layer = 1
+    
+    def spawn(self, x, y, enemy_type="normal", angle=0.0):
+        type_id = ENEMY_TYPE_IDS[enemy_type]
+        health = ENEMY_HEALTH[type_id]
+        return self.add(
+            x=x,
+            y=y,
+            prev_x=x,
+            prev_y=y,
+            type=type_id,
+            health=health,
+            max_health=health,
+            size=ENEMY_SIZE[type_id],
+            speed=ENEMY_SPEED[type_id],
+            hit_flash=0,
+            # Movement pattern
+            angle=angle,
+            movement_timer=0,
+            active=True,
+        )
+        
+    def spawn_many(self, x, y, type_ids, angle):
+        # Vectorized spawn() for arrays of positions, type ids and angles
+        health = ENEMY_HEALTH[type_ids]
+        return self.extend(
+            len(x), x=x, y=y, prev_x=x, prev_y=y, type=type_ids,
+            health=health, max_health=health, size=ENEMY_SIZE[type_ids],
+            speed=ENEMY_SPEED[type_ids], hit_flash=0, angle=angle,
+            movement_timer=0, active=True,
+        )
+        
+    def bounding_rects(self, alpha=1.0):
+        # Body plus room for the health bar above special enemies
+        n = self.count
+        x, y = self.interpolate(alpha)
+        half = np.maximum(self.size[:n], 20) + 2
+        left = (x - half).astype(np.int32).tolist()
+        top = (y - self.size[:n] - 17).astype(np.int32).tolist()
+        width = (half * 2 + 1).astype(np.int32).tolist()
+        height = (self.size[:n] * 2 + 20).astype(np.int32).tolist()
+        return list(zip(left, top, width, height))
+        
+    def swept_boxes(self):
+        # Bounds of each enemy's circle over the last tick
+        n = self.count
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        x1, y1 = self.x[:n], self.y[:n]
+        size = self.size[:n]
+        return (np.minimum(x0, x1) - size, np.minimum(y0, y1) - size,
+                np.maximum(x0, x1) + size, np.maximum(y0, y1) + size)
+        
+    def take_damage(self, index):
+        self.health[index] -= 1
+        self.hit_flash[index] = 0.2
+        if self.health[index] <= 0:
+            self.active[index] = False
             return True
         return False
         
-    def draw(self, screen):
-        if self.active:
-            color = RED if self.type == "normal" else PURPLE
-            if self.hit_flash > 0:
-                color = WHITE
-                
-            # Draw enemy body
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size, 2)
+    def draw(self, screen, sprites, alpha, scale, settings):
+        n = self.count
+        outlines = settings.enemy_outlines
+        xs, ys = self.interpolate(alpha)
+        if scale != 1.0:
+            xs = xs * scale
+            ys = ys * scale
+        entries = {}
+        sequence = []
+        for x, y, enemy_type, size, hit_flash in zip(
+                xs.tolist(), ys.tolist(), self.type[:n].tolist(),
+                self.size[:n].tolist(), self.hit_flash[:n].tolist()):
+            key = ("enemy", enemy_type, hit_flash > 0, outlines)
+            entry = entries.get(key)
+            if entry is None:
+                color = ENEMY_COLORS[enemy_type]
+                if hit_flash > 0:
+                    color = WHITE
+                entry = entries[key] = sprites.get(key, render_enemy_sprite, int(size), color,
+                                                   outlines)
+            surface, (ax, ay) = entry
+            sequence.append((surface, (int(x) - ax, int(y) - ay)))
+        screen.blits(sequence, doreturn=False)
+        
+        # Draw health bars for damaged enemies
+        damaged = self.health[:n] < self.max_health[:n]
+        for i in np.flatnonzero(damaged):
+            bar_width = 40 * scale
+            bar_height = 6 * scale
+            bar_x = xs[i] - bar_width // 2
+            bar_y = ys[i] - (self.size[i] + 15) * scale
             
-            # Draw health bar for special enemies
-            if self.type == "special" and self.health < self.max_health:
-                bar_width = 40
-                bar_height = 6
-                bar_x = self.x - bar_width // 2
-                bar_y = self.y - self.size - 15
-                
-                pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
-                health_width = (self.health / self.max_health) * bar_width
-                pygame.draw.rect(screen, GREEN, (bar_x, bar_y, health_width, bar_height))
+            pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
+            health_width = (self.health[i] / self.max_health[i]) * bar_width
+            pygame.draw.rect(screen, GREEN, (bar_x, bar_y, health_width, bar_height))
 
-class PowerUp:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.size = 12
-        self.active = True
-        self.pulse_timer = 0
-        
-    def update(self, dt, corridor_speed):
-        if self.active:
-            self.y += corridor_speed * dt
-            self.pulse_timer += dt
-            
-            if self.y > SCREEN_HEIGHT + 50:
-                self.active = False
-                
-    def draw(self, screen):
-        if self.active:
-            pulse = math.sin(self.pulse_timer * 8) * 0.3 + 0.7
-            size = int(self.size * pulse)
-            pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), size)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), size, 2)
-            
-            # Draw inner star
-            points = []
-            for i in range(8):
-                angle = i * math.pi / 4
-                if i % 2 == 0:
-                    r = size * 0.6
-                else:
-                    r = size * 0.3
-                px = self.x + math.cos(angle) * r
-                py = self.y + math.sin(angle) * r
-                points.append((px, py))
-            pygame.draw.polygon(screen, YELLOW, points)
+class PowerUpBatch(Table):
+    components = (POSITION, SCROLL, COLLIDER, PULSE, RENDER)
+    fields = archetype(*components)
+    bounds = (-np.inf, -np.inf, np.inf, SCREEN_HEIGHT + 50)
+    layer = 2
+    
+    def spawn(self, x, y):
+        return self.add(x=x, y=y, prev_x=x, prev_y=y, size=12, pulse_timer=0, active=True)
+        
+    def spawn_many(self, x, y):
+        return self.extend(len(x), x=x, y=y, prev_x=x, prev_y=y, size=12, pulse_timer=0,
+                           active=True)
+        
+    def bounding_rects(self, alpha=1.0):
+        n = self.count
+        x, y = self.interpolate(alpha)
+        left = (x - self.size[:n] - 2).astype(np.int32).tolist()
+        top = (y - self.size[:n] - 2).astype(np.int32).tolist()
+        side = (self.size[:n] * 2 + 5).astype(np.int32).tolist()
+        return list(zip(left, top, side, side))
+        
+    def draw(self, screen, sprites, alpha, scale, settings):
+        n = self.count
+        xs, ys = self.interpolate(alpha)
+        if scale != 1.0:
+            xs = xs * scale
+            ys = ys * scale
+        # Pulse sizes are quantized to whole pixels, one sprite per size
+        pulse = np.sin(self.pulse_timer[:n] * 8) * 0.3 + 0.7
+        sizes = (self.size[:n] * pulse).astype(np.int32)
+        sequence = []
+        for x, y, size in zip(xs.tolist(), ys.tolist(), sizes.tolist()):
+            surface, (ax, ay) = sprites.get(("power_up", size), render_power_up_sprite, size)
+            sequence.append((surface, (int(x) - ax, int(y) - ay)))
+        screen.blits(sequence, doreturn=False)
+
+def render(world, screen, sprites, alpha, scale, settings, lap=None):
+    # Render system: draws every table with RENDER, back to front, each
+    # through its own draw(). settings is the quality.QualityLevel to draw
+    # at; lap("draw.<table>") is called after each table when given.
+    for name, table in world.render_order():
+        if table.count:
+            table.draw(screen, sprites, alpha, scale, settings)
+        if lap is not None:
+            lap("draw." + name)
 
 class RailShooter:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Rail Shooter - Corridor Run")
+    def __init__(self, headless=False, time_source=None, dirty_rects=False, seed=None,
+                 waves=None, render_scale=1.0, window_scale=1.0):
+        # Headless games never open a window; they are driven by
+        # simulation.Simulation or replay.py instead of run(), and draw into
+        # an offscreen surface if they draw at all
+        self.headless = headless
+        
+        # Game time advances with update(dt), so shield regen does not depend
+        # on the wall clock unless a different time source is injected
+        self.game_time = 0.0
+        self.time_source = time_source or self.game_clock
+        
+        # All gameplay randomness comes from this per-game generator, so a
+        # seed plus the recorded inputs reproduce a session exactly. Input
+        # logs store it as an unsigned 64-bit number, so any other int is
+        # wrapped into that range up front and the log, the RNG and the
+        # game all agree on it.
+        if seed is None:
+            seed = random.randrange(2**63)
+        seed %= 2**64
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
+        # The window, fonts and HUD labels are set up by open_display() when
+        # the first frame is drawn
+        self.screen = None
+        self.window = None
+        
+        # Game logic and every draw call work in logical SCREEN_WIDTH x
+        # SCREEN_HEIGHT coordinates. The frame is rendered into self.screen
+        # at render_scale times that size, and presented to a window
+        # window_scale times that size with one scaled blit. When the two
+        # scales match, self.screen is the window itself.
+        self.render_scale = render_scale
+        self.window_scale = window_scale
+        self.render_size = (round(SCREEN_WIDTH * render_scale), round(SCREEN_HEIGHT * render_scale))
+        
+        # Opt-in partial redraw instead of clearing and flipping the whole screen
+        self.dirty = None
+        if dirty_rects and not headless:
+            self.dirty = DirtyRectRenderer(*self.render_size)
         self.clock = pygame.time.Clock()
         
         # Game state
@@ -209,43 +388,136 @@ class RailShooter:
         self.slow_motion_duration = 3.0
         self.slow_motion_timer = 0
         self.time_scale = 1.0
+        self.power_up_charge = 25      # slow motion charge per power up
+        self.special_kill_charge = 15  # slow motion charge per special kill
         
         # Ship position (moves automatically along path)
         self.ship_path_progress = 0
         self.ship_x = SCREEN_WIDTH // 2
         self.ship_y = SCREEN_HEIGHT - 100
+        self.prev_ship_x = self.ship_x
+        self.prev_ship_y = self.ship_y
         
         # Corridor effect
         self.corridor_speed = 200
-        self.corridor_lines = []
-        self.init_corridor()
+        self.corridor_phase = 0.0
+        self.prev_corridor_phase = 0.0
+        self.corridor = CorridorBackground(SCREEN_WIDTH, SCREEN_HEIGHT, spacing=50,
+                                           scale=render_scale)
+        
+        # Every entity lives in a component table of the world and is moved
+        # by the systems in ecs.py, one whole column at a time
+        particle_seed = self.rng.getrandbits(64)
+        self.world = World()
+        self.bullets = self.world.add("bullets", BulletBatch())
+        self.enemies = self.world.add("enemies", EnemyBatch())
+        self.power_ups = self.world.add("power_ups", PowerUpBatch())
+        self.particles = self.world.add("particles", ParticleSystem(seed=particle_seed))
+        
+        # Pre-rendered entity sprites
+        self.sprites = SpriteCache(capacity=64, scale=render_scale)
         
-        # Game objects
-        self.bullets = []
-        self.enemies = []
-        self.particles = []
-        self.power_ups = []
+        # Visual detail, lowered by the adaptive quality scaler in run() when
+        # frames go over budget (see quality.py)
+        self.quality = QualityScaler(1000 / FPS)
+        self.particle_limit = self.particles.limit
+        self.apply_quality(0)
+        
+        # Cell size of the broad phase for bullet-enemy collisions
+        self.collision_cell_size = 32
         
         # Spawn timers
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = 2.0
+        self.min_enemy_spawn_interval = 0.8
         self.power_up_spawn_timer = 0
         self.power_up_spawn_interval = 8.0
+        self.special_enemy_chance = 0.2
+        
+        # Scripted spawns from a wave file replace the random timers above
+        # (see waves.py); wave_time is the level clock
+        self.waves_path = waves
+        self.waves = None
+        if waves is not None:
+            self.waves = SpawnScheduler.from_file(waves, ENEMY_TYPE_IDS, seed, SCREEN_WIDTH)
+        self.wave_time = 0.0
+        
+        # Optional telemetry.TelemetryLog that spawns, kills, score changes,
+        # shield hits, slow motion and frame times are recorded to
+        self.telemetry = None
+        
+        # Optional capture.FrameCapture that every drawn frame is copied to
+        self.capture = None
         
         # Mouse
         self.crosshair_x = SCREEN_WIDTH // 2
         self.crosshair_y = SCREEN_HEIGHT // 2
         
         # Font
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
-        
-    def init_corridor(self):
-        # Create initial corridor lines for 3D effect
-        for i in range(20):
-            y = i * 50
-            self.corridor_lines.append(y)
-            
+        self.font = None
+        self.small_font = None
+        
+        # Frame-time instrumentation; F3 toggles the overlay
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        
+        # HUD text: static labels are rendered once by open_display(),
+        # value-dependent strings are re-rendered through the cache only when
+        # they change
+        self.text_cache = TextCache(capacity=64)
+        self.labels = {}
+        
+    def open_display(self):
+        # Start the display and font subsystems, open the window and load
+        # the fonts. Called on the first frame; sprites and corridor frames
+        # are rendered on first use after this, in the display's format.
+        # Headless games only get an offscreen 32-bit surface to draw into.
+        if self.screen is not None:
+            return
+        pygame.font.init()
+        if self.headless:
+            self.screen = pygame.Surface(self.render_size, 0, 32)
+        else:
+            pygame.display.init()
+            window_size = (round(SCREEN_WIDTH * self.window_scale),
+                           round(SCREEN_HEIGHT * self.window_scale))
+            self.window = pygame.display.set_mode(window_size)
+            pygame.display.set_caption("Rail Shooter - Corridor Run")
+            self.screen = self.window
+            if self.render_size != window_size:
+                self.screen = pygame.Surface(self.render_size).convert()
+        
+        self.font = pygame.font.Font(None, round(36 * self.render_scale))
+        self.small_font = pygame.font.Font(None, round(24 * self.render_scale))
+        self.labels = {
+            "slow_motion": self.small_font.render("Slow Motion", True, WHITE),
+            "slow_motion_active": self.font.render("SLOW MOTION", True, CYAN),
+            "game_over": self.font.render("GAME OVER", True, RED),
+            "restart": self.small_font.render("Press R to restart or ESC to quit", True, WHITE),
+        }
+        
+    def logical_pos(self, pos):
+        # Window pixels to game coordinates
+        if self.window_scale == 1.0:
+            return pos
+        return (int(pos[0] / self.window_scale), int(pos[1] / self.window_scale))
+        
+    def apply_quality(self, level):
+        settings = LEVELS[level]
+        self.quality_level = level
+        self.explosion_particles = settings.explosion_particles
+        # Entities are drawn at this level's detail (see ecs.render)
+        self.detail = settings
+        self.corridor.simple = settings.simple_corridor
+        self.particles.limit = self.particle_limit
+        if settings.particle_cap is not None:
+            self.particles.limit = min(self.particle_limit, settings.particle_cap)
+        if self.dirty:
+            self.dirty.invalidate()
+        
+    def game_clock(self):
+        return self.game_time
+        
     def update_ship_position(self, dt):
         # Automatic ship movement along a curved path
         self.ship_path_progress += dt * 0.5
@@ -255,44 +527,55 @@ class RailShooter:
         path_y = SCREEN_HEIGHT - 100 + math.sin(self.ship_path_progress * 0.7) * 30
         
         # Smooth movement towards path position
+        self.prev_ship_x = self.ship_x
+        self.prev_ship_y = self.ship_y
         self.ship_x += (path_x - self.ship_x) * dt * 3
         self.ship_y += (path_y - self.ship_y) * dt * 3
         
     def spawn_enemy(self):
-        x = random.randint(50, SCREEN_WIDTH - 50)
+        x = self.rng.randint(50, SCREEN_WIDTH - 50)
         y = -50
         
-        # 20% chance for special enemy
-        enemy_type = "special" if random.random() < 0.2 else "normal"
-        self.enemies.append(Enemy(x, y, enemy_type))
+        enemy_type = "special" if self.rng.random() < self.special_enemy_chance else "normal"
+        self.enemies.spawn(x, y, enemy_type, angle=self.rng.uniform(0, 2 * math.pi))
+        if self.telemetry is not None:
+            self.telemetry.record(ENEMY_SPAWN, self.game_time, x, y, ENEMY_TYPE_IDS[enemy_type])
         
     def spawn_power_up(self):
-        x = random.randint(50, SCREEN_WIDTH - 50)
+        x = self.rng.randint(50, SCREEN_WIDTH - 50)
         y = -50
-        self.power_ups.append(PowerUp(x, y))
+        self.power_ups.spawn(x, y)
+        if self.telemetry is not None:
+            self.telemetry.record(POWER_UP_SPAWN, self.game_time, x, y)
         
+    def spawn_events(self, events):
+        # Spawn a batch of due wave events, one array append per kind
+        telemetry = self.telemetry
+        enemies = [event for event in events if event[2] == SPAWN_ENEMY]
+        if enemies:
+            _, _, _, type_ids, x, y, angle = zip(*enemies)
+            x, y, type_ids = np.array(x), np.array(y), np.array(type_ids)
+            self.enemies.spawn_many(x, y, type_ids, np.array(angle))
+            if telemetry is not None:
+                telemetry.record_many(ENEMY_SPAWN, self.game_time, x, y, type_ids)
+        power_ups = [event for event in events if event[2] == SPAWN_POWER_UP]
+        if power_ups:
+            _, _, _, _, x, y, _ = zip(*power_ups)
+            x, y = np.array(x), np.array(y)
+            self.power_ups.spawn_many(x, y)
+            if telemetry is not None:
+                telemetry.record_many(POWER_UP_SPAWN, self.game_time, x, y, np.zeros(len(x)))
+            
     def create_explosion(self, x, y, color=ORANGE):
         # Create explosion particles
-        for _ in range(15):
-            velocity = (random.uniform(-200, 200), random.uniform(-200, 200))
-            lifetime = random.uniform(0.5, 1.5)
-            self.particles.append(Particle(x, y, color, velocity, lifetime))
+        self.particles.emit(x, y, color, self.explosion_particles)
             
-    def handle_collision(self, bullet, enemy):
-        # Check collision between bullet and enemy
-        dx = bullet.x - enemy.x
-        dy = bullet.y - enemy.y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        return distance < enemy.size
-        
-    def handle_power_up_collision(self, power_up):
-        # Check collision between ship and power up
-        dx = self.ship_x - power_up.x
-        dy = self.ship_y - power_up.y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        return distance < 30
+    def handle_power_up_collision(self):
+        # Indices of the power ups touching the ship
+        n = self.power_ups.count
+        dx = self.power_ups.x[:n] - self.ship_x
+        dy = self.power_ups.y[:n] - self.ship_y
+        return np.flatnonzero(self.power_ups.active[:n] & (dx * dx + dy * dy < 30 * 30))
         
     def update_slow_motion(self, dt):
         if self.slow_motion_active:
@@ -307,11 +590,18 @@ class RailShooter:
             
     def activate_slow_motion(self):
         if self.slow_motion_charge >= self.max_slow_motion:
+            if self.telemetry is not None:
+                self.telemetry.record(EVENT_SLOW_MOTION, self.game_time, value=self.slow_motion_charge)
             self.slow_motion_active = True
             self.slow_motion_timer = self.slow_motion_duration
             self.slow_motion_charge = 0
             
     def update(self, dt):
+        # Each stage's time is charged to the profiler with lap()
+        lap = self.profiler.lap
+        
+        self.game_time += dt
+        
         # Apply time scale for slow motion
         scaled_dt = dt * self.time_scale
         
@@ -322,136 +612,169 @@ class RailShooter:
         self.update_ship_position(scaled_dt)
         
         # Shield regeneration (only if not recently damaged)
-        current_time = time.time()
+        current_time = self.time_source()
         if current_time - self.last_damage_time > 2.0:  # 2 second delay
             self.shield = min(self.max_shield, self.shield + self.shield_regen_rate * dt)
             
-        # Update corridor effect
-        for i in range(len(self.corridor_lines)):
-            self.corridor_lines[i] += self.corridor_speed * scaled_dt
-            if self.corridor_lines[i] > SCREEN_HEIGHT:
-                self.corridor_lines[i] = -50
+        # Update corridor effect; the line pattern repeats every period
+        self.prev_corridor_phase = self.corridor_phase
+        self.corridor_phase = (self.corridor_phase + self.corridor_speed * scaled_dt) % self.corridor.period
+        lap("update.world")
                 
-        # Spawn enemies
-        self.enemy_spawn_timer += scaled_dt
-        if self.enemy_spawn_timer >= self.enemy_spawn_interval:
-            self.spawn_enemy()
-            self.enemy_spawn_timer = 0
-            # Gradually increase spawn rate
-            self.enemy_spawn_interval = max(0.8, self.enemy_spawn_interval - 0.01)
-            
-        # Spawn power ups
-        self.power_up_spawn_timer += scaled_dt
-        if self.power_up_spawn_timer >= self.power_up_spawn_interval:
-            self.spawn_power_up()
-            self.power_up_spawn_timer = 0
-            
-        # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update(scaled_dt)
-            if not bullet.active:
-                self.bullets.remove(bullet)
+        # Scripted waves: everything that came due this tick spawns as one batch
+        waves = self.waves
+        self.wave_time += scaled_dt
+        if waves is not None:
+            due = waves.release(self.wave_time)
+            if due:
+                self.spawn_events(due)
                 
-        # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.update(scaled_dt, self.corridor_speed)
-            if not enemy.active:
-                self.enemies.remove(enemy)
+        # Random spawning when there is no wave file, or after an endless one
+        if waves is None or (waves.endless and waves.exhausted):
+            # Spawn enemies
+            self.enemy_spawn_timer += scaled_dt
+            if self.enemy_spawn_timer >= self.enemy_spawn_interval:
+                self.spawn_enemy()
+                self.enemy_spawn_timer = 0
+                # Gradually increase spawn rate
+                self.enemy_spawn_interval = max(self.min_enemy_spawn_interval, self.enemy_spawn_interval - 0.01)
                 
-        # Update power ups
-        for power_up in self.power_ups[:]:
-            power_up.update(scaled_dt, self.corridor_speed)
-            if not power_up.active:
-                self.power_ups.remove(power_up)
-            elif self.handle_power_up_collision(power_up):
-                power_up.active = False
-                self.power_ups.remove(power_up)
-                self.slow_motion_charge = min(self.max_slow_motion, self.slow_motion_charge + 25)
-                self.create_explosion(power_up.x, power_up.y, YELLOW)
+            # Spawn power ups
+            self.power_up_spawn_timer += scaled_dt
+            if self.power_up_spawn_timer >= self.power_up_spawn_interval:
+                self.spawn_power_up()
+                self.power_up_spawn_timer = 0
+        lap("update.spawn")
+            
+        # Movement systems, each over every table with the right components
+        # and timed as its own stage
+        world = self.world
+        store_previous(world)
+        lap("update.previous")
+        integrate(world, scaled_dt)
+        lap("update.integrate")
+        scroll(world, scaled_dt, self.corridor_speed)
+        lap("update.scroll")
+        sway(world, scaled_dt, SCREEN_WIDTH)
+        lap("update.sway")
+        pulse(world, scaled_dt)
+        lap("update.pulse")
+        decay_flash(world, scaled_dt)
+        lap("update.flash")
+        age(world, scaled_dt)
+        lap("update.age")
+                
+        # Power up pickups
+        telemetry = self.telemetry
+        power_ups = self.power_ups
+        for index in self.handle_power_up_collision():
+            power_ups.active[index] = False
+            self.slow_motion_charge = min(self.max_slow_motion, self.slow_motion_charge + self.power_up_charge)
+            self.create_explosion(power_ups.x[index], power_ups.y[index], YELLOW)
+            if telemetry is not None:
+                telemetry.record(PICKUP, self.game_time, power_ups.x[index], power_ups.y[index],
+                                 self.slow_motion_charge)
+        lap("update.power_ups")
                 
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update(scaled_dt)
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
+        # Collisions are swept over the tick: bullets, enemies and the ship
+        # move in straight lines from their previous to their current
+        # positions, so nothing passes through anything between two ticks
+        # however large dt is.
+        bullets = self.bullets
+        enemies = self.enemies
+        nb = bullets.count
+        n = enemies.count
+        if nb and n:
+            # Candidate pairs from a uniform grid over the swept bounds, then
+            # an exact segment-vs-circle test on all candidates at once
+            b, e = grid_pairs(bullets.swept_boxes(), enemies.swept_boxes(),
+                              self.collision_cell_size)
+            t = swept_contact(bullets.prev_x[b], bullets.prev_y[b], bullets.x[b], bullets.y[b],
+                              enemies.prev_x[e], enemies.prev_y[e], enemies.x[e], enemies.y[e],
+                              enemies.size[e])
+            hit = np.isfinite(t)
+            b, e, t = b[hit], e[hit], t[hit]
+            
+            # Each bullet hits the first enemy it reaches that is still alive
+            order = np.lexsort((t, b))
+            alive = enemies.active[:n].tolist()
+            spent = []
+            for bullet, i in zip(b[order].tolist(), e[order].tolist()):
+                if not alive[i] or (spent and spent[-1] == bullet):
+                    continue
+                spent.append(bullet)
                 
-        # Check bullet-enemy collisions
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if bullet.active and enemy.active and self.handle_collision(bullet, enemy):
-                    bullet.active = False
-                    self.bullets.remove(bullet)
+                if enemies.take_damage(i):
+                    alive[i] = False
+                    # Enemy destroyed
+                    enemy_type = enemies.type[i]
+                    self.score += ENEMY_POINTS[enemy_type]
+                    if telemetry is not None:
+                        telemetry.record(KILL, self.game_time, enemies.x[i], enemies.y[i],
+                                         ENEMY_POINTS[enemy_type])
+                        telemetry.record(SCORE, self.game_time, value=self.score)
                     
-                    if enemy.take_damage():
-                        # Enemy destroyed
-                        points = 100 if enemy.type == "special" else 50
-                        self.score += points
+                    # Some enemies give slow motion charge
+                    if ENEMY_CHARGES[enemy_type]:
+                        self.slow_motion_charge = min(self.max_slow_motion, 
+                                                    self.slow_motion_charge + self.special_kill_charge)
                         
-                        # Special enemies give slow motion charge
-                        if enemy.type == "special":
-                            self.slow_motion_charge = min(self.max_slow_motion, 
-                                                        self.slow_motion_charge + 15)
-                            
-                        self.create_explosion(enemy.x, enemy.y)
-                        self.enemies.remove(enemy)
-                    break
+                    self.create_explosion(enemies.x[i], enemies.y[i])
+            bullets.active[spent] = False
                     
-        # Check enemy-ship collisions (damage shield)
-        for enemy in self.enemies[:]:
-            dx = self.ship_x - enemy.x
-            dy = self.ship_y - enemy.y
-            distance = math.sqrt(dx*dx + dy*dy)
+        # Check enemy-ship collisions (damage shield), 40 px ship radius
+        t = swept_contact(enemies.prev_x[:n], enemies.prev_y[:n], enemies.x[:n], enemies.y[:n],
+                          self.prev_ship_x, self.prev_ship_y, self.ship_x, self.ship_y, 40)
+        rammed = enemies.active[:n] & np.isfinite(t)
+        for i in np.flatnonzero(rammed):
+            self.shield -= 20
+            self.last_damage_time = self.time_source()
+            if telemetry is not None:
+                telemetry.record(SHIELD_HIT, self.game_time, enemies.x[i], enemies.y[i], self.shield)
+            self.create_explosion(enemies.x[i], enemies.y[i], RED)
+            enemies.active[i] = False
             
-            if distance < 40:  # Ship collision radius
-                self.shield -= 20
-                self.last_damage_time = time.time()
-                self.create_explosion(enemy.x, enemy.y, RED)
-                enemy.active = False
-                self.enemies.remove(enemy)
+            if self.shield <= 0:
+                self.state = GameState.GAME_OVER
                 
-                if self.shield <= 0:
-                    self.state = GameState.GAME_OVER
+        lap("update.collisions")
+        
+        # Drop everything that expired, was hit or left the screen in one
+        # pass. Bullets are culled after the collision checks so they can
+        # still hit something on their way out.
+        cull(world)
+        world.compact()
+        lap("update.compact")
                     
     def shoot(self, target_x, target_y):
-        bullet = Bullet(self.ship_x, self.ship_y - 20, target_x, target_y)
-        self.bullets.append(bullet)
-        
-    def draw_corridor(self):
-        # Draw 3D-like corridor effect
-        for i, y in enumerate(self.corridor_lines):
-            if 0 <= y <= SCREEN_HEIGHT:
-                # Calculate perspective scaling
-                scale = (y + 100) / (SCREEN_HEIGHT + 100)
-                width = int(SCREEN_WIDTH * scale)
-                
-                # Draw corridor walls
-                left_x = (SCREEN_WIDTH - width) // 2
-                right_x = left_x + width
-                
-                color_intensity = int(100 * scale)
-                color = (color_intensity, color_intensity, color_intensity)
-                
-                if i % 2 == 0:  # Grid lines
-                    pygame.draw.line(self.screen, color, (left_x, y), (right_x, y), 2)
-                    
-                # Side walls
-                if i > 0 and i < len(self.corridor_lines) - 1:
-                    prev_y = self.corridor_lines[i-1]
-                    if 0 <= prev_y <= SCREEN_HEIGHT:
-                        prev_scale = (prev_y + 100) / (SCREEN_HEIGHT + 100)
-                        prev_width = int(SCREEN_WIDTH * prev_scale)
-                        prev_left = (SCREEN_WIDTH - prev_width) // 2
-                        prev_right = prev_left + prev_width
-                        
-                        pygame.draw.line(self.screen, color, (left_x, y), (prev_left, prev_y), 1)
-                        pygame.draw.line(self.screen, color, (right_x, y), (prev_right, prev_y), 1)
+        self.bullets.spawn(self.ship_x, self.ship_y - 20, target_x, target_y)
+        
+    def render_corridor_phase(self, alpha):
+        # The phase wraps at the corridor period, so step forward from the
+        # previous tick's phase rather than interpolating across the wrap
+        step = (self.corridor_phase - self.prev_corridor_phase) % self.corridor.period
+        return self.prev_corridor_phase + step * alpha
+        
+    def render_ship_position(self, alpha):
+        return (self.prev_ship_x + (self.ship_x - self.prev_ship_x) * alpha,
+                self.prev_ship_y + (self.ship_y - self.prev_ship_y) * alpha)
+        
+    def render_bullet_positions(self, alpha):
+        x, y = self.bullets.interpolate(alpha)
+        return list(zip(x.astype(np.int32).tolist(), y.astype(np.int32).tolist()))
+        
+    def draw_corridor(self, alpha=1.0):
+        # Draw 3D-like corridor effect from the pre-rendered frame for this phase
+        self.corridor.draw(self.screen, self.render_corridor_phase(alpha))
                         
     def draw_ui(self):
+        s = self.render_scale
+        
         # Shield bar
-        shield_width = 200
-        shield_height = 20
-        shield_x = 20
-        shield_y = 20
+        shield_width = 200 * s
+        shield_height = 20 * s
+        shield_x = 20 * s
+        shield_y = 20 * s
         
         pygame.draw.rect(self.screen, DARK_GRAY, (shield_x, shield_y, shield_width, shield_height))
         shield_fill = (self.shield / self.max_shield) * shield_width
@@ -459,14 +782,14 @@ class RailShooter:
         pygame.draw.rect(self.screen, shield_color, (shield_x, shield_y, shield_fill, shield_height))
         pygame.draw.rect(self.screen, WHITE, (shield_x, shield_y, shield_width, shield_height), 2)
         
-        shield_text = self.small_font.render(f"Shield: {int(self.shield)}", True, WHITE)
-        self.screen.blit(shield_text, (shield_x, shield_y + 25))
+        shield_text = self.text_cache.render(self.small_font, f"Shield: {int(self.shield)}", WHITE)
+        self.screen.blit(shield_text, (shield_x, shield_y + 25 * s))
         
         # Slow motion charge bar
-        sm_width = 150
-        sm_height = 15
-        sm_x = 20
-        sm_y = 70
+        sm_width = 150 * s
+        sm_height = 15 * s
+        sm_x = 20 * s
+        sm_y = 70 * s
         
         pygame.draw.rect(self.screen, DARK_GRAY, (sm_x, sm_y, sm_width, sm_height))
         sm_fill = (self.slow_motion_charge / self.max_slow_motion) * sm_width
@@ -474,73 +797,98 @@ class RailShooter:
         pygame.draw.rect(self.screen, sm_color, (sm_x, sm_y, sm_fill, sm_height))
         pygame.draw.rect(self.screen, WHITE, (sm_x, sm_y, sm_width, sm_height), 2)
         
-        sm_text = self.small_font.render("Slow Motion", True, WHITE)
-        self.screen.blit(sm_text, (sm_x, sm_y + 20))
+        sm_text = self.labels["slow_motion"]
+        self.screen.blit(sm_text, (sm_x, sm_y + 20 * s))
         
         # Score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (SCREEN_WIDTH - 200, 20))
+        score_text = self.text_cache.render(self.font, f"Score: {self.score}", WHITE)
+        self.screen.blit(score_text, ((SCREEN_WIDTH - 200) * s, 20 * s))
         
         # Slow motion indicator
         if self.slow_motion_active:
-            sm_indicator = self.font.render("SLOW MOTION", True, CYAN)
-            text_rect = sm_indicator.get_rect(center=(SCREEN_WIDTH//2, 100))
+            sm_indicator = self.labels["slow_motion_active"]
+            text_rect = sm_indicator.get_rect(center=(SCREEN_WIDTH//2 * s, 100 * s))
             self.screen.blit(sm_indicator, text_rect)
             
+    def ui_rects(self):
+        # Screen areas draw_ui can touch, sized for the longest expected text
+        rects = [
+            (18, 18, 204, 50),                 # Shield bar and text
+            (18, 68, 154, 42),                 # Slow motion bar and text
+            (SCREEN_WIDTH - 202, 18, 202, 32), # Score
+        ]
+        if self.slow_motion_active:
+            rects.append((SCREEN_WIDTH//2 - 120, 80, 240, 40))
+        return rects
+        
+    def collect_dirty_rects(self, alpha=1.0):
+        # Bounding boxes of everything draw(alpha) is about to put on screen,
+        # in render pixels
+        x, y = self.particles.interpolate(alpha)
+        rects = tile_rects(x, y, ParticleSystem.MAX_SIZE + 1)
+        
+        rects.extend(self.enemies.bounding_rects(alpha))
+        rects.extend(self.power_ups.bounding_rects(alpha))
+        rects.extend((x - 7, y - 7, 15, 15) for x, y in self.render_bullet_positions(alpha))
+        ship_x, ship_y = self.render_ship_position(alpha)
+        rects.append((int(ship_x) - 18, int(ship_y) - 23, 37, 47))
+        rects.extend(self.ui_rects())
+        rects.append((self.crosshair_x - 22, self.crosshair_y - 22, 45, 45))
+        
+        if self.state == GameState.GAME_OVER:
+            rects.append((SCREEN_WIDTH//2 - 250, SCREEN_HEIGHT//2 - 80, 500, 160))
+        if self.render_scale != 1.0:
+            rects = scale_rects(rects, self.render_scale)
+            
+        # Already in render pixels
+        rects.extend(self.corridor.dirty_rects(self.render_corridor_phase(alpha)))
+        if self.profiler_overlay.visible:
+            rects.append(self.profiler_overlay.rect())
+        return rects
+        
     def draw_crosshair(self):
         # Draw crosshair at mouse position
-        size = 20
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.crosshair_x - size, self.crosshair_y), 
-                        (self.crosshair_x + size, self.crosshair_y), 2)
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.crosshair_x, self.crosshair_y - size), 
-                        (self.crosshair_x, self.crosshair_y + size), 2)
-        pygame.draw.circle(self.screen, WHITE, (self.crosshair_x, self.crosshair_y), size, 2)
-        
-    def draw_ship(self):
+        s = self.render_scale
+        size = 20 * s
+        x = self.crosshair_x * s
+        y = self.crosshair_y * s
+        pygame.draw.line(self.screen, WHITE, (x - size, y), (x + size, y), 2)
+        pygame.draw.line(self.screen, WHITE, (x, y - size), (x, y + size), 2)
+        pygame.draw.circle(self.screen, WHITE, (x, y), size, 2)
+        
+    def draw_ship(self, alpha=1.0):
         # Draw player ship
-        ship_points = [
-            (self.ship_x, self.ship_y - 20),
-            (self.ship_x - 15, self.ship_y + 10),
-            (self.ship_x, self.ship_y + 5),
-            (self.ship_x + 15, self.ship_y + 10)
-        ]
-        pygame.draw.polygon(self.screen, CYAN, ship_points)
-        pygame.draw.polygon(self.screen, WHITE, ship_points, 2)
-        
-        # Engine glow
-        glow_points = [
-            (self.ship_x - 8, self.ship_y + 10),
-            (self.ship_x, self.ship_y + 20),
-            (self.ship_x + 8, self.ship_y + 10)
-        ]
-        pygame.draw.polygon(self.screen, ORANGE, glow_points)
+        surface, (ax, ay) = self.sprites.get(("ship",), render_ship_sprite)
+        ship_x, ship_y = self.render_ship_position(alpha)
+        s = self.render_scale
+        self.screen.blit(surface, (int(ship_x * s) - ax, int(ship_y * s) - ay))
+        
+    def draw(self, alpha=1.0):
+        # alpha places moving objects between the previous tick (0.0) and
+        # the current one (1.0), so motion stays smooth when the render rate
+        # differs from the tick rate
+        if self.screen is None:
+            self.open_display()
+        lap = self.profiler.lap
         
-    def draw(self):
-        self.screen.fill(BLACK)
+        if self.dirty:
+            # Only clear what changed since the last frame
+            self.dirty.begin(self.collect_dirty_rects(alpha))
+            self.dirty.clear(self.screen, BLACK)
+        else:
+            self.screen.fill(BLACK)
+        lap("draw.clear")
         
         # Draw corridor
-        self.draw_corridor()
+        self.draw_corridor(alpha)
+        lap("draw.corridor")
         
-        # Draw particles (behind everything)
-        for particle in self.particles:
-            particle.draw(self.screen)
-            
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-            
-        # Draw power ups
-        for power_up in self.power_ups:
-            power_up.draw(self.screen)
-            
-        # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        # Draw entities: particles behind everything, then enemies, power
+        # ups and bullets (their tables' layers)
+        render(self.world, self.screen, self.sprites, alpha, self.render_scale, self.detail, lap)
             
         # Draw ship
-        self.draw_ship()
+        self.draw_ship(alpha)
         
         # Draw UI
         self.draw_ui()
@@ -550,19 +898,43 @@ class RailShooter:
         
         if self.state == GameState.GAME_OVER:
             # Game over screen
-            game_over_text = self.font.render("GAME OVER", True, RED)
-            score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-            restart_text = self.small_font.render("Press R to restart or ESC to quit", True, WHITE)
+            game_over_text = self.labels["game_over"]
+            score_text = self.text_cache.render(self.font, f"Final Score: {self.score}", WHITE)
+            restart_text = self.labels["restart"]
             
-            game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
+            s = self.render_scale
+            game_over_rect = game_over_text.get_rect(
+                center=(SCREEN_WIDTH//2 * s, (SCREEN_HEIGHT//2 - 50) * s))
+            score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2 * s, SCREEN_HEIGHT//2 * s))
+            restart_rect = restart_text.get_rect(
+                center=(SCREEN_WIDTH//2 * s, (SCREEN_HEIGHT//2 + 50) * s))
             
             self.screen.blit(game_over_text, game_over_rect)
             self.screen.blit(score_text, score_rect)
             self.screen.blit(restart_text, restart_rect)
+        lap("draw.ui")
+        
+        # Captured frames are at render resolution, without the overlay
+        if self.capture is not None:
+            self.capture.add(self.screen)
+            lap("draw.capture")
+        if self.window is None:
+            return
+            
+        if self.screen is not self.window:
+            # One scaled blit from the render resolution to the window
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            lap("draw.upscale")
             
-        pygame.display.flip()
+        # The overlay is drawn at window resolution
+        self.profiler_overlay.draw(self.window)
+        lap("draw.overlay")
+            
+        if self.dirty and self.screen is self.window:
+            self.dirty.present()
+        else:
+            pygame.display.flip()
+        lap("draw.present")
         
     def reset_game(self):
         self.state = GameState.PLAYING
@@ -576,18 +948,106 @@ class RailShooter:
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = 2.0
         self.power_up_spawn_timer = 0
+        self.wave_time = 0.0
+        if self.waves is not None:
+            self.waves.seek(0.0)
+        
+        # Tables keep their arrays allocated
+        self.world.clear()
+        
+    def entity_counts(self):
+        return self.world.counts()
         
-        # Clear all game objects
-        self.bullets.clear()
-        self.enemies.clear()
-        self.particles.clear()
-        self.power_ups.clear()
+    def apply_input(self, tick):
+        # Single entry point for player input, shared by run() and replays
+        if tick.reset and self.state == GameState.GAME_OVER:
+            self.reset_game()
+        if self.state == GameState.PLAYING:
+            for x, y in tick.shots:
+                self.shoot(x, y)
+            if tick.slow_motion:
+                self.activate_slow_motion()
+        self.crosshair_x = tick.crosshair_x
+        self.crosshair_y = tick.crosshair_y
         
-    def run(self):
+    def state_digest(self):
+        # Hash of the gameplay state, used to check that a replay ends up
+        # exactly where the recorded session did
+        digest = hashlib.sha1()
+        digest.update(struct.pack(
+            "<BqdddBdddddd", self.state.value, self.score, self.shield, self.slow_motion_charge,
+            self.slow_motion_timer, self.slow_motion_active, self.ship_x, self.ship_y,
+            self.game_time, self.enemy_spawn_timer, self.enemy_spawn_interval,
+            self.power_up_spawn_timer))
+        bullets = self.bullets
+        for column in (bullets.x, bullets.y):
+            digest.update(column[:bullets.count].tobytes())
+        enemies = self.enemies
+        for column in (enemies.x, enemies.y, enemies.health):
+            digest.update(column[:enemies.count].tobytes())
+        power_ups = self.power_ups
+        for column in (power_ups.x, power_ups.y):
+            digest.update(column[:power_ups.count].tobytes())
+        return digest.digest()
+        
+    def snapshot(self, compress=False):
+        # Compact binary copy of the whole game state, see snapshot.py
+        return save_state(self, compress)
+        
+    def restore(self, data):
+        # Continue from a snapshot() taken from this or any other game. Wave
+        # timelines are not stored; the game must have the same wave file,
+        # which is recompiled if the snapshot came from another seed.
+        seed = self.seed
+        load_state(self, data)
+        if self.waves is not None:
+            if self.seed != seed:
+                self.waves = SpawnScheduler.from_file(self.waves_path, ENEMY_TYPE_IDS,
+                                                    self.seed, SCREEN_WIDTH)
+            self.waves.seek(self.wave_time)
+        if self.dirty:
+            self.dirty.invalidate()
+        
+    def run(self, profile_out=None, record_to=None, tick_ms=TICK_MS, uncapped=False,
+            telemetry_to=None, adaptive_quality=True, capture_to=None):
+        # Fixed-rate game loop: wall-clock time accumulates each frame and is
+        # spent in whole ticks of tick_ms, so update() always sees the same
+        # dt no matter how long a frame took. Drawing then interpolates
+        # between the last two ticks with the leftover fraction of a tick.
+        # With uncapped=True frames are drawn as fast as the machine allows
+        # instead of at FPS. capture_to records every drawn frame (see
+        # capture.py), dropping frames rather than slowing the game down.
+        self.open_display()
         running = True
+        profiler = self.profiler
+        # Every frame's row is only kept when it is going to be exported
+        profiler.keep_session = bool(profile_out)
+        recording = InputLog(self.seed) if record_to else None
+        if telemetry_to:
+            self.telemetry = TelemetryLog(telemetry_to, self.seed)
+        if capture_to:
+            self.capture = FrameCapture(capture_to, wait=False)
+        telemetry = self.telemetry
+        tick_dt = tick_ms / 1000.0
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        
+        # Input gathered since the last tick; frames that run no tick keep
+        # adding to it, so no click is lost between ticks
+        tick = TickInput(tick_ms, self.crosshair_x, self.crosshair_y)
+        
+        # F5 stores a checkpoint and F9 returns to it. Not while recording,
+        # since a replay could not reproduce the jump.
+        checkpoint = None
         
         while running:
-            dt = self.clock.tick(FPS) / 1000.0
+            self.clock.tick(0 if uncapped else FPS)
+            now = time.perf_counter()
+            accumulator += now - last_time
+            if telemetry is not None:
+                telemetry.begin_frame(self.game_time, now - last_time)
+            last_time = now
+            profiler.begin_frame()
             
             # Handle events
             for event in pygame.event.get():
@@ -595,32 +1055,320 @@ class RailShooter:
                     running = False
                     
                 elif event.type == pygame.MOUSEMOTION:
-                    self.crosshair_x, self.crosshair_y = event.pos
+                    tick.crosshair_x, tick.crosshair_y = self.logical_pos(event.pos)
                     
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
-                        if self.state == GameState.PLAYING:
-                            self.shoot(self.crosshair_x, self.crosshair_y)
+                        tick.shots.append(self.logical_pos(event.pos))
                             
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
-                        if self.state == GameState.PLAYING:
-                            self.activate_slow_motion()
+                        tick.slow_motion = True
                     elif event.key == pygame.K_r:
-                        if self.state == GameState.GAME_OVER:
-                            self.reset_game()
+                        tick.reset = True
+                    elif event.key == pygame.K_F3:
+                        self.profiler_overlay.toggle()
+                        if self.dirty:
+                            self.dirty.invalidate()
+                    elif event.key == pygame.K_F5:
+                        checkpoint = self.snapshot()
+                    elif event.key == pygame.K_F9:
+                        if checkpoint is not None and recording is None:
+                            self.restore(checkpoint)
                     elif event.key == pygame.K_ESCAPE:
                         running = False
+            profiler.lap("events")
                         
-            # Update game
-            if self.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
-                self.update(dt)
+            # Update game in fixed ticks; pending input goes to the first one
+            ticks = 0
+            while accumulator >= tick_dt and ticks < MAX_TICKS_PER_FRAME:
+                self.apply_input(tick)
+                if recording is not None:
+                    recording.append(tick)
+                if self.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+                    self.update(tick_dt)
+                tick = TickInput(tick_ms, self.crosshair_x, self.crosshair_y)
+                accumulator -= tick_dt
+                ticks += 1
+            if accumulator >= tick_dt:
+                # Too far behind to catch up: drop the backlog
+                accumulator %= tick_dt
                 
-            # Draw everything
-            self.draw()
+            # Draw everything; a stopped game has nothing to interpolate
+            alpha = 1.0
+            if self.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+                alpha = accumulator / tick_dt
+            self.draw(alpha)
+            counts = self.entity_counts()
+            counts["quality"] = self.quality_level
+            profiler.end_frame(counts)
+            
+            # Shed or restore visual detail based on this frame's work time
+            if adaptive_quality and self.quality.observe((time.perf_counter() - now) * 1000):
+                self.apply_quality(self.quality.level)
+                if telemetry is not None:
+                    telemetry.record(QUALITY, self.game_time, value=self.quality_level)
             
+        if recording is not None:
+            recording.finish(self.score, self.state_digest())
+            recording.save(record_to)
+        if telemetry_to:
+            telemetry.close()
+        if capture_to:
+            self.capture.close()
+            
+        # Per-session profile as <prefix>.csv (every frame) and <prefix>.json (summary)
+        if profile_out:
+            profiler.export_csv(profile_out + ".csv")
+            profiler.export_json(profile_out + ".json")
+        profiler.close()
         pygame.quit()
-
+        
+    def run_pipelined(self, profile_out=None, record_to=None, tick_ms=TICK_MS, uncapped=False,
+                      telemetry_to=None, adaptive_quality=True, capture_to=None):
+        # Pipelined game loop: the main thread polls input and draws, a
+        # simulation thread runs the fixed ticks. SDL only allows window,
+        # event and display calls on the main thread, so everything touching
+        # them stays here. Input events are stamped when polled and queued,
+        # and each tick takes the events stamped inside its own time slice,
+        # so ticks keep running on time however long a frame takes.
+        #
+        # The simulation runs on a headless copy of this game. After ticks
+        # it publishes a snapshot() of the last completed tick as immutable
+        # bytes; the main thread loads the newest one into this game and
+        # draws it, interpolating towards the present like run() does.
+        self.open_display()
+        sim = RailShooter(headless=True, seed=self.seed, waves=self.waves_path)
+        sim.restore(self.snapshot())
+        profiler = self.profiler
+        # Every frame's row is only kept when it is going to be exported
+        profiler.keep_session = sim.profiler.keep_session = bool(profile_out)
+        recording = InputLog(self.seed) if record_to else None
+        if telemetry_to:
+            self.telemetry = TelemetryLog(telemetry_to, self.seed)
+        if capture_to:
+            self.capture = FrameCapture(capture_to, wait=False)
+        # Telemetry frames are the batches of ticks run by the simulation
+        # thread, which records every event
+        telemetry = sim.telemetry = self.telemetry
+        inputs = InputQueue()
+        tick_dt = tick_ms / 1000.0
+        
+        # (snapshot bytes, wall time at the end of its tick). Only swapped
+        # as a whole, so a frame never draws half a tick.
+        self.published = (sim.snapshot(), time.perf_counter())
+        frame_taken = threading.Event()
+        frame_taken.set()
+        stopped = threading.Event()
+        # F5 and F9 are handed to the simulation thread, which owns sim
+        commands = deque()
+        errors = []
+        self.pointer = (self.crosshair_x, self.crosshair_y)
+        
+        sim_thread = threading.Thread(
+            target=sim.simulate_loop,
+            args=(tick_ms, inputs, commands, self.quality, recording, frame_taken, stopped, errors,
+                  self),
+            name="simulation", daemon=True)
+        # Hand the GIL over more often, so ticks are not held up by a long
+        # stretch of Python in draw(). This is process-wide; it is put back
+        # when the loop ends.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(PIPELINED_SWITCH_INTERVAL)
+        sim_thread.start()
+        
+        shown = None
+        try:
+            while not stopped.is_set():
+                self.clock.tick(0 if uncapped else FPS)
+                now = time.perf_counter()
+                profiler.begin_frame()
+                for event in pygame.event.get():
+                    if self.queue_input(event, now, inputs):
+                        continue
+                    
+                    if event.type == pygame.QUIT:
+                        stopped.set()
+                    
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_F3:
+                            self.profiler_overlay.toggle()
+                            if self.dirty:
+                                self.dirty.invalidate()
+                        elif event.key in (pygame.K_F5, pygame.K_F9):
+                            commands.append(event.key)
+                        elif event.key == pygame.K_ESCAPE:
+                            stopped.set()
+                profiler.lap("events")
+                
+                data, tick_end = self.published
+                if data is not shown:
+                    load_state(self, data)
+                    shown = data
+                    frame_taken.set()
+                profiler.lap("load")
+                
+                # The crosshair follows the mouse directly rather than the
+                # last tick
+                self.crosshair_x, self.crosshair_y = self.pointer
+                alpha = 1.0
+                if self.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+                    alpha = min(1.0, (time.perf_counter() - tick_end) / tick_dt)
+                self.draw(alpha)
+                counts = self.entity_counts()
+                counts["quality"] = self.quality_level
+                profiler.end_frame(counts)
+                
+                # The simulation thread follows the level picked here
+                if adaptive_quality and self.quality.observe((time.perf_counter() - now) * 1000):
+                    self.apply_quality(self.quality.level)
+        finally:
+            stopped.set()
+            sim_thread.join()
+            sys.setswitchinterval(switch_interval)
+        
+        self.restore(sim.snapshot())
+        if errors:
+            raise errors[0]
+        
+        if recording is not None:
+            recording.finish(sim.score, sim.state_digest())
+            recording.save(record_to)
+        if telemetry_to:
+            telemetry.close()
+        if capture_to:
+            self.capture.close()
+        
+        # Drawn frames go to <prefix>.csv/.json as in run(), simulation
+        # steps to <prefix>.sim.csv/.json
+        if profile_out:
+            profiler.export_csv(profile_out + ".csv")
+            profiler.export_json(profile_out + ".json")
+            sim.profiler.export_csv(profile_out + ".sim.csv")
+            sim.profiler.export_json(profile_out + ".sim.json")
+        sim.profiler.close()
+        profiler.close()
+        pygame.quit()
+    
+    def simulate_loop(self, tick_ms, inputs, commands, quality, recording, frame_taken, stopped,
+                      errors, display):
+        # Simulation thread of run_pipelined(), run on the headless copy.
+        # Runs every tick whose time slice has ended and publishes the
+        # result on `display` whenever the main thread took the last one.
+        profiler = self.profiler
+        telemetry = self.telemetry
+        tick_dt = tick_ms / 1000.0
+        checkpoint = None
+        next_tick = time.perf_counter() + tick_dt
+        last_batch = next_tick - tick_dt
+        tick_end = display.published[1]
+        stale = False
+        try:
+            while not stopped.is_set():
+                # F5 stores a checkpoint and F9 returns to it, as in run()
+                while commands:
+                    if commands.popleft() == pygame.K_F5:
+                        checkpoint = self.snapshot()
+                    elif checkpoint is not None and recording is None:
+                        self.restore(checkpoint)
+                        stale = True
+                
+                # The main thread picks the quality level; explosion sizes
+                # and the particle cap take effect here
+                if self.quality_level != quality.level:
+                    self.apply_quality(quality.level)
+                    if telemetry is not None:
+                        telemetry.record(QUALITY, self.game_time, value=self.quality_level)
+                
+                now = time.perf_counter()
+                ticks = 0
+                if next_tick <= now:
+                    profiler.begin_frame()
+                    if telemetry is not None:
+                        telemetry.begin_frame(self.game_time, now - last_batch)
+                    last_batch = now
+                while next_tick <= now and ticks < MAX_TICKS_PER_FRAME:
+                    tick = inputs.take(next_tick, TickInput(tick_ms, self.crosshair_x, self.crosshair_y))
+                    self.apply_input(tick)
+                    if recording is not None:
+                        recording.append(tick)
+                    if self.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+                        self.update(tick_dt)
+                    tick_end = next_tick
+                    next_tick += tick_dt
+                    ticks += 1
+                    stale = True
+                if ticks:
+                    profiler.end_frame(self.entity_counts())
+                if next_tick <= now:
+                    # Too far behind to catch up: drop the backlog
+                    next_tick += (now - next_tick) // tick_dt * tick_dt + tick_dt
+                
+                # Publish at most one snapshot per drawn frame
+                if stale and frame_taken.is_set():
+                    frame_taken.clear()
+                    display.published = (self.snapshot(), tick_end)
+                    stale = False
+                
+                time.sleep(max(0.0, min(next_tick - time.perf_counter(), SIMULATION_POLL_INTERVAL)))
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            stopped.set()
+    
+    def queue_input(self, event, now, inputs):
+        # Push a player input event onto the InputQueue of run_pipelined(),
+        # stamped with the time it was polled. Returns False for events
+        # that are not game input.
+        if event.type == pygame.MOUSEMOTION:
+            pos = self.logical_pos(event.pos)
+            inputs.push(now, AIM, pos)
+            self.pointer = pos
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+            inputs.push(now, SHOOT, self.logical_pos(event.pos))
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            inputs.push(now, SLOW_MOTION)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+            inputs.push(now, RESET)
+        else:
+            return False
+        return True
+    
 if __name__ == "__main__":
-    game = RailShooter()
-    game.run()
+    parser = argparse.ArgumentParser(description="Rail Shooter - Corridor Run")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only changed screen areas instead of the full frame")
+    parser.add_argument("--profile-out", metavar="PREFIX",
+                        help="write per-frame timings to PREFIX.csv and a summary to PREFIX.json")
+    parser.add_argument("--seed", type=int,
+                        help="seed for enemy and power-up spawns, taken modulo 2**64 "
+                             "(random by default)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record this session's inputs for replay.py")
+    parser.add_argument("--waves", metavar="PATH",
+                        help="JSON or TOML wave file to play instead of random spawns")
+    parser.add_argument("--tick-ms", type=int, default=TICK_MS,
+                        help=f"simulation tick length in ms (default: {TICK_MS})")
+    parser.add_argument("--uncapped", action="store_true",
+                        help=f"draw frames as fast as possible instead of at {FPS} FPS")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="stream per-frame game events to PATH (read with telemetry.py)")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="always draw at full detail instead of adapting to frame times")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run the simulation on its own thread while the main thread draws")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="record drawn frames as PNGs into directory PATH, or as raw "
+                             "rgb24 video if PATH ends in .raw")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="draw at this fraction of the game resolution and scale up (default: 1)")
+    parser.add_argument("--window-scale", type=float, default=1.0,
+                        help="window size as a multiple of the game resolution (default: 1)")
+    args = parser.parse_args()
+    
+    game = RailShooter(dirty_rects=args.dirty_rects, seed=args.seed, waves=args.waves,
+                       render_scale=args.render_scale, window_scale=args.window_scale)
+    run = game.run_pipelined if args.pipelined else game.run
+    run(profile_out=args.profile_out, record_to=args.record,
+        tick_ms=args.tick_ms, uncapped=args.uncapped, telemetry_to=args.telemetry,
+        adaptive_quality=not args.fixed_quality, capture_to=args.capture)
@@ -0,0 +1,107 @@
+import argparse
+import time
+
+from capture import FrameCapture
+from inputs import InputLog
+from rail_shooter import FPS, GameState, RailShooter
+
+
+class ReplayResult:
+    def __init__(self, ticks, wall_time, score, digest, expected_score, expected_digest,
+                 frames=0):
+        self.ticks = ticks
+        self.wall_time = wall_time
+        self.score = score
+        self.digest = digest
+        self.expected_score = expected_score
+        self.expected_digest = expected_digest
+        self.frames = frames
+
+    @property
+    def ok(self):
+        return self.score == self.expected_score and self.digest == self.expected_digest
+
+    def as_dict(self):
+        return {
+            "ticks": self.ticks,
+            "wall_time": self.wall_time,
+            "score": self.score,
+            "expected_score": self.expected_score,
+            "digest": self.digest.hex(),
+            "expected_digest": self.expected_digest.hex(),
+            "ok": self.ok,
+            "frames": self.frames,
+        }
+
+
+def replay(log, game=None, waves=None, fps=None):
+    # Re-simulate a recorded session headless, as fast as the CPU allows,
+    # feeding the recorded inputs through the same apply_input/update path
+    # that run() uses. Sessions played with a wave file need the same file.
+    # With fps set, the game also draws a frame every 1/fps s of game time,
+    # interpolated between ticks like run() does, e.g. into game.capture.
+    if game is None:
+        game = RailShooter(headless=True, seed=log.seed, waves=waves)
+
+    start = time.perf_counter()
+    elapsed = 0.0
+    frames = 0
+    for tick in log.ticks:
+        game.apply_input(tick)
+        dt = tick.dt_ms / 1000.0
+        playing = game.state in [GameState.PLAYING, GameState.SLOW_MOTION]
+        if playing:
+            game.update(dt)
+        # Frames due within this tick
+        while fps and frames / fps <= elapsed + dt:
+            game.draw((frames / fps - elapsed) / dt if playing else 1.0)
+            frames += 1
+        elapsed += dt
+    wall_time = time.perf_counter() - start
+
+    return ReplayResult(len(log.ticks), wall_time, game.score, game.state_digest(),
+                        log.final_score, log.final_digest, frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify a recorded Rail Shooter session")
+    parser.add_argument("log", help="input log written by rail_shooter.py --record")
+    parser.add_argument("--waves", metavar="PATH", help="wave file the session was played with")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="also render the session as PNGs into directory PATH, or as raw "
+                             "rgb24 video if PATH ends in .raw")
+    parser.add_argument("--fps", type=float, default=FPS,
+                        help=f"frame rate of the captured clip (default: {FPS})")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="captured frame size as a fraction of the game resolution")
+    parser.add_argument("--workers", type=int, default=4, help="encoder threads")
+    args = parser.parse_args()
+
+    log = InputLog.load(args.log)
+    if args.capture:
+        game = RailShooter(headless=True, seed=log.seed, waves=args.waves,
+                           render_scale=args.render_scale)
+        game.capture = FrameCapture(args.capture, workers=args.workers)
+        start = time.perf_counter()
+        result = replay(log, game, fps=args.fps)
+        # The clip is done once the encoders are
+        game.capture.close()
+        result.wall_time = time.perf_counter() - start
+    else:
+        result = replay(log, waves=args.waves)
+    recorded = sum(tick.dt_ms for tick in log.ticks) / 1000.0
+    print(f"ticks={result.ticks} recorded={recorded:.1f}s replayed in {result.wall_time:.3f}s "
+          f"score={result.score} (expected {result.expected_score}) "
+          f"{'OK' if result.ok else 'MISMATCH'}")
+    if args.capture:
+        width, height = game.render_size
+        print(f"{result.frames} frames ({result.frames / result.wall_time:.0f} frames/s, "
+              f"{recorded / result.wall_time:.1f}x real time) written to {args.capture}")
+        if args.capture.endswith(".raw"):
+            print(f"encode with: ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} "
+                  f"-r {args.fps:g} -i {args.capture} clip.mp4")
+    raise SystemExit(0 if result.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import time
+
+from rail_shooter import TICK_MS, GameState, RailShooter
+
+
+class SimClock:
+    # Manually advanced clock, injected into RailShooter as its time source
+    # so shield regen follows simulated time instead of the wall clock
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def advance(self, dt):
+        self.now += dt
+
+    def __call__(self):
+        return self.now
+
+
+class SimResult:
+    def __init__(self, ticks, sim_time, wall_time, score, shield, game_over):
+        self.ticks = ticks
+        self.sim_time = sim_time
+        self.wall_time = wall_time
+        self.score = score
+        self.shield = shield
+        self.game_over = game_over
+
+    @property
+    def ticks_per_second(self):
+        if self.wall_time <= 0:
+            return float("inf")
+        return self.ticks / self.wall_time
+
+    def as_dict(self):
+        return {
+            "ticks": self.ticks,
+            "sim_time": self.sim_time,
+            "wall_time": self.wall_time,
+            "score": self.score,
+            "shield": self.shield,
+            "game_over": self.game_over,
+        }
+
+
+class Simulation:
+    # Fixed-timestep driver for a headless RailShooter. Every tick advances
+    # the injected clock by exactly dt and calls RailShooter.update(dt), so
+    # the same game logic runs as fast as the CPU allows with no display.
+    def __init__(self, game=None, dt=TICK_MS / 1000.0, controller=None, seed=None, waves=None):
+        self.dt = dt
+        self.clock = SimClock()
+        if game is None:
+            game = RailShooter(headless=True, time_source=self.clock, seed=seed, waves=waves)
+        else:
+            game.time_source = self.clock
+        self.game = game
+        # Optional callable(game) run before each tick, e.g. an aiming bot
+        self.controller = controller
+        self.ticks = 0
+
+    @classmethod
+    def from_snapshot(cls, data, dt=TICK_MS / 1000.0, controller=None, waves=None):
+        # A new headless simulation continuing from RailShooter.snapshot(),
+        # e.g. to fork many runs from one mid-game state
+        sim = cls(dt=dt, controller=controller, waves=waves)
+        sim.game.restore(data)
+        sim.clock.now = sim.game.game_time
+        return sim
+
+    @property
+    def sim_time(self):
+        return self.clock.now
+
+    def step(self):
+        if self.controller:
+            self.controller(self.game)
+        self.clock.advance(self.dt)
+        if self.game.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+            self.game.update(self.dt)
+        self.ticks += 1
+
+    def run(self, max_time=None, max_ticks=None, until_game_over=True):
+        if max_time is None and max_ticks is None and not until_game_over:
+            raise ValueError("Simulation.run needs a stop condition")
+
+        start = time.perf_counter()
+        while True:
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+            if max_time is not None and self.sim_time >= max_time:
+                break
+            if until_game_over and self.game.state == GameState.GAME_OVER:
+                break
+            self.step()
+        wall_time = time.perf_counter() - start
+
+        return SimResult(
+            self.ticks,
+            self.sim_time,
+            wall_time,
+            self.game.score,
+            self.game.shield,
+            self.game.state == GameState.GAME_OVER,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Rail Shooter headless")
+    parser.add_argument("--seconds", type=float, default=300.0,
+                        help="simulated seconds to run (default: 300)")
+    parser.add_argument("--dt", type=float, default=TICK_MS / 1000.0,
+                        help="fixed timestep in seconds")
+    parser.add_argument("--seed", type=int, help="game seed (random by default)")
+    parser.add_argument("--waves", metavar="PATH", help="wave file to play")
+    args = parser.parse_args()
+
+    result = Simulation(dt=args.dt, seed=args.seed, waves=args.waves).run(max_time=args.seconds)
+    print(f"ticks={result.ticks} sim_time={result.sim_time:.1f}s "
+          f"wall_time={result.wall_time:.3f}s "
+          f"({result.ticks_per_second:.0f} ticks/s) "
+          f"score={result.score} shield={result.shield:.0f} "
+          f"game_over={result.game_over}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import struct
+import zlib
+
+# Game state snapshot layout (little endian):
+#   header    magic, version, flags, seed
+#   scalars   SCALARS: game state id, flags, then every field in FLOAT_FIELDS
+#             and INT_FIELDS
+#   rng       the game's Mersenne Twister state (RNG) and the particle
+#             system's PCG64 state (PCG)
+#   sections  one per entity container in CONTAINERS: row count, byte length
+#             and the container's own snapshot() blob
+# With FLAG_ZLIB set, everything after the header is zlib-compressed. The
+# seed is an unsigned 64-bit number, the range RailShooter wraps seeds into.
+MAGIC = b"RSSS"
+VERSION = 3
+HEADER = struct.Struct("<4sHHQ")
+FLAG_ZLIB = 1
+
+FLOAT_FIELDS = (
+    "shield", "max_shield", "shield_regen_rate", "last_damage_time",
+    "slow_motion_charge", "max_slow_motion", "slow_motion_duration", "slow_motion_timer",
+    "time_scale", "power_up_charge", "special_kill_charge",
+    "ship_path_progress", "ship_x", "ship_y", "prev_ship_x", "prev_ship_y",
+    "corridor_speed", "corridor_phase", "prev_corridor_phase",
+    "enemy_spawn_timer", "enemy_spawn_interval", "min_enemy_spawn_interval",
+    "power_up_spawn_timer", "power_up_spawn_interval", "special_enemy_chance",
+    "wave_time", "game_time",
+)
+INT_FIELDS = ("score", "crosshair_x", "crosshair_y")
+SCALARS = struct.Struct("<BB" + "d" * len(FLOAT_FIELDS) + "q" * len(INT_FIELDS))
+ACTIVE_SLOW_MOTION = 1
+
+RNG = struct.Struct("<625IBd")
+PCG = struct.Struct("<16s16sBI")
+SECTION = struct.Struct("<II")
+CONTAINERS = ("bullets", "enemies", "power_ups", "particles")
+
+
+def pack_rng(rng):
+    version, internal, gauss_next = rng.getstate()
+    return RNG.pack(*internal, gauss_next is not None,
+                    gauss_next if gauss_next is not None else 0.0)
+
+
+def unpack_rng(rng, data, offset):
+    values = RNG.unpack_from(data, offset)
+    rng.setstate((3, values[:625], values[626] if values[625] else None))
+
+
+def pack_pcg(generator):
+    state = generator.bit_generator.state
+    return PCG.pack(state["state"]["state"].to_bytes(16, "little"),
+                    state["state"]["inc"].to_bytes(16, "little"),
+                    state["has_uint32"], state["uinteger"])
+
+
+def unpack_pcg(generator, data, offset):
+    state, inc, has_uint32, uinteger = PCG.unpack_from(data, offset)
+    generator.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+
+def save_state(game, compress=False):
+    # Everything update() reads or writes, so a restored game continues
+    # exactly as the original would have
+    flags = ACTIVE_SLOW_MOTION if game.slow_motion_active else 0
+    parts = [
+        SCALARS.pack(game.state.value, flags,
+                     *(float(getattr(game, name)) for name in FLOAT_FIELDS),
+                     *(int(getattr(game, name)) for name in INT_FIELDS)),
+        pack_rng(game.rng),
+        pack_pcg(game.particles.rng),
+    ]
+    for name in CONTAINERS:
+        container = getattr(game, name)
+        blob = container.snapshot()
+        parts.append(SECTION.pack(container.count, len(blob)))
+        parts.append(blob)
+
+    body = b"".join(parts)
+    if compress:
+        body = zlib.compress(body, 1)
+    return HEADER.pack(MAGIC, VERSION, FLAG_ZLIB if compress else 0, game.seed) + body
+
+
+def load_state(game, data):
+    magic, version, flags, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a Rail Shooter snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    body = memoryview(data)[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = memoryview(zlib.decompress(body))
+
+    values = SCALARS.unpack_from(body)
+    game.seed = seed
+    game.state = type(game.state)(values[0])
+    game.slow_motion_active = bool(values[1] & ACTIVE_SLOW_MOTION)
+    floats = values[2:2 + len(FLOAT_FIELDS)]
+    for name, value in zip(FLOAT_FIELDS, floats):
+        setattr(game, name, value)
+    for name, value in zip(INT_FIELDS, values[2 + len(FLOAT_FIELDS):]):
+        setattr(game, name, value)
+    offset = SCALARS.size
+
+    unpack_rng(game.rng, body, offset)
+    offset += RNG.size
+    unpack_pcg(game.particles.rng, body, offset)
+    offset += PCG.size
+
+    for name in CONTAINERS:
+        count, length = SECTION.unpack_from(body, offset)
+        offset += SECTION.size
+        getattr(game, name).restore(count, body[offset:offset + length])
+        offset += length
+
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    # LRU cache of pre-rasterized sprites. Each visual variant is drawn once
+    # by its render function into a colorkeyed Surface and then reused with
+    # blit/Surface.blits. Entries are (surface, (anchor_x, anchor_y)), where
+    # the anchor is the pixel that lines up with the entity position.
+    # Render functions take a `scale` keyword and draw at that multiple of
+    # their logical size, so sprites are rasterized at render resolution.
+    def __init__(self, capacity=128, scale=1.0):
+        self.capacity = capacity
+        self.scale = scale
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, render, *args):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        surface, anchor = render(*args, scale=self.scale)
+        # Match the display format when there is one for faster blits
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        entry = (surface, anchor)
+        self.entries[key] = entry
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+
+
+def scaled_width(width, scale):
+    # Outline width in render pixels, never thinner than one pixel
+    return max(1, round(width * scale))
+
+
+def blit_sequence(entry, positions):
+    # Build the Surface.blits sequence that draws one sprite at many integer
+    # (x, y) entity positions
+    surface, (ax, ay) = entry
+    return [(surface, (x - ax, y - ay)) for x, y in positions]
@@ -0,0 +1,207 @@
+"""Parallel balance sweeps over many headless Rail Shooter games.
+
+Every combination of --param values is played with each seed by the chosen
+bot in a process pool. One CSV row per game is streamed to --out as results
+arrive, and a per-parameter-set summary is printed at the end.
+
+    python sweep.py --param enemy_spawn_interval=1.5,2.0 \\
+                    --param shield_regen_rate=10,20 --seeds 200 --out sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from bots import BOTS
+from rail_shooter import TICK_MS, GameState
+from simulation import Simulation
+
+# RailShooter attributes a sweep may override
+TUNABLE = {
+    "enemy_spawn_interval": float,
+    "min_enemy_spawn_interval": float,
+    "power_up_spawn_interval": float,
+    "shield_regen_rate": float,
+    "slow_motion_duration": float,
+    "power_up_charge": float,
+    "special_kill_charge": float,
+    "special_enemy_chance": float,
+}
+
+RESULT_FIELDS = [
+    "param_set", "seed", "bot", "score", "survival_time", "game_over",
+    "peak_bullets", "peak_enemies", "peak_power_ups", "peak_particles",
+    "ticks", "wall_time",
+]
+
+
+def play(param_set, params, seed, bot, max_time, dt, waves=None):
+    sim = Simulation(dt=dt, seed=seed, controller=BOTS[bot](seed), waves=waves)
+    game = sim.game
+    for name, value in params.items():
+        setattr(game, name, value)
+
+    peak_bullets = peak_enemies = peak_power_ups = peak_particles = 0
+    start = time.perf_counter()
+    while sim.sim_time < max_time and game.state != GameState.GAME_OVER:
+        sim.step()
+        peak_bullets = max(peak_bullets, len(game.bullets))
+        peak_enemies = max(peak_enemies, len(game.enemies))
+        peak_power_ups = max(peak_power_ups, len(game.power_ups))
+        peak_particles = max(peak_particles, len(game.particles))
+
+    row = {
+        "param_set": param_set,
+        "seed": seed,
+        "bot": bot,
+        "score": game.score,
+        "survival_time": round(sim.sim_time, 4),
+        "game_over": game.state == GameState.GAME_OVER,
+        "peak_bullets": peak_bullets,
+        "peak_enemies": peak_enemies,
+        "peak_power_ups": peak_power_ups,
+        "peak_particles": peak_particles,
+        "ticks": sim.ticks,
+        "wall_time": round(time.perf_counter() - start, 4),
+    }
+    row.update(params)
+    return row
+
+
+def play_chunk(jobs):
+    # Several games per task keeps inter-process traffic low
+    return [play(*job) for job in jobs]
+
+
+def parse_param(text):
+    name, _, values = text.partition("=")
+    if name not in TUNABLE:
+        raise argparse.ArgumentTypeError(
+            f"unknown parameter {name!r}; choose from {', '.join(TUNABLE)}")
+    try:
+        return name, [TUNABLE[name](value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad values for {name}: {values!r}")
+
+
+def param_sets(params):
+    names = [name for name, _ in params]
+    for values in itertools.product(*(values for _, values in params)):
+        yield dict(zip(names, values))
+
+
+def jobs(params, seeds, first_seed, bot, max_time, dt, waves=None):
+    # Generated lazily so huge sweeps never materialize the job list
+    for param_set, values in enumerate(param_sets(params)):
+        for seed in range(first_seed, first_seed + seeds):
+            yield (param_set, values, seed, bot, max_time, dt, waves)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_sweep(job_iter, on_result, workers=None, chunk_size=8):
+    # Keeps a bounded number of chunks in flight and hands every finished
+    # game to on_result as soon as it arrives
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    chunks = chunked(job_iter, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in itertools.islice(chunks, max_in_flight):
+            pending.add(pool.submit(play_chunk, chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for row in future.result():
+                    on_result(row)
+            for chunk in itertools.islice(chunks, len(done)):
+                pending.add(pool.submit(play_chunk, chunk))
+
+
+class Summary:
+    # Running per-parameter-set aggregates; memory grows with the number of
+    # parameter sets, not the number of games
+    def __init__(self):
+        self.sets = {}
+
+    def add(self, row):
+        stats = self.sets.get(row["param_set"])
+        if stats is None:
+            stats = self.sets[row["param_set"]] = {
+                "games": 0, "score": 0.0, "survival_time": 0.0, "game_over": 0,
+                "peak_enemies": 0, "peak_particles": 0, "params": {
+                    name: row[name] for name in TUNABLE if name in row},
+            }
+        stats["games"] += 1
+        stats["score"] += row["score"]
+        stats["survival_time"] += row["survival_time"]
+        stats["game_over"] += row["game_over"]
+        stats["peak_enemies"] = max(stats["peak_enemies"], row["peak_enemies"])
+        stats["peak_particles"] = max(stats["peak_particles"], row["peak_particles"])
+
+    def print_table(self, out=sys.stdout):
+        print(f"{'set':>4} {'games':>6} {'mean score':>11} {'mean survival':>14} "
+              f"{'deaths':>7} {'peak enemies':>13} {'peak particles':>15}  params", file=out)
+        for param_set in sorted(self.sets):
+            stats = self.sets[param_set]
+            games = stats["games"]
+            params = " ".join(f"{k}={v}" for k, v in stats["params"].items())
+            print(f"{param_set:>4} {games:>6} {stats['score'] / games:>11.1f} "
+                  f"{stats['survival_time'] / games:>13.1f}s {stats['game_over']:>7} "
+                  f"{stats['peak_enemies']:>13} {stats['peak_particles']:>15}  {params}",
+                  file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        metavar="NAME=V1,V2,...", help="parameter values to sweep")
+    parser.add_argument("--seeds", type=int, default=10, help="games per parameter set")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--bot", choices=sorted(BOTS), default="aim")
+    parser.add_argument("--max-time", type=float, default=600.0,
+                        help="simulated seconds before a surviving game is stopped")
+    parser.add_argument("--dt", type=float, default=TICK_MS / 1000.0)
+    parser.add_argument("--waves", metavar="PATH", help="wave file every game plays")
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="games per task")
+    parser.add_argument("--out", help="CSV file for per-game rows (default: stdout)")
+    args = parser.parse_args()
+
+    fields = RESULT_FIELDS + [name for name, _ in args.param]
+    out = open(args.out, "w", newline="") if args.out else sys.stdout
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    summary = Summary()
+
+    def on_result(row):
+        writer.writerow(row)
+        summary.add(row)
+
+    start = time.perf_counter()
+    try:
+        run_sweep(jobs(args.param, args.seeds, args.first_seed, args.bot, args.max_time, args.dt,
+                       args.waves),
+                  on_result, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    games = sum(stats["games"] for stats in summary.sets.values())
+    print(f"\n{games} games in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    summary.print_table(sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections import deque
+
+import numpy as np
+
+# Telemetry log file layout (little endian):
+#   header   magic, version, seed, rows per chunk
+#   chunks   CHUNK (row count, then the compressed byte length of every
+#            column in EVENT order), followed by each column's rows,
+#            zlib-compressed on their own so a reader can unpack only the
+#            columns it needs
+# The file is valid after every chunk, so it can be read while a session
+# is still writing it.
+MAGIC = b"RSTL"
+VERSION = 1
+HEADER = struct.Struct("<4sHQI")
+
+# One row per event: the frame it happened in, game time, event kind, a
+# position where there is one, and a kind-specific value
+EVENT = np.dtype([
+    ("frame", np.uint32),
+    ("time", np.float64),
+    ("kind", np.uint8),
+    ("x", np.float32),
+    ("y", np.float32),
+    ("value", np.float64),
+])
+CHUNK = struct.Struct("<I" + "I" * len(EVENT.names))
+
+# Event kinds and what `value` holds for them
+FRAME = 0           # frame length in seconds
+ENEMY_SPAWN = 1     # enemy type id
+POWER_UP_SPAWN = 2
+KILL = 3            # points scored
+SCORE = 4           # score after the change
+SHIELD_HIT = 5      # shield left
+SLOW_MOTION = 6     # slow motion charge spent
+PICKUP = 7          # slow motion charge after the pickup
+QUALITY = 8         # new quality level
+KIND_NAMES = ("frame", "enemy_spawn", "power_up_spawn", "kill", "score", "shield_hit",
+              "slow_motion", "pickup", "quality")
+
+
+class TelemetryLog:
+    # Low-overhead event recorder. Events go into a ring of `chunks`
+    # preallocated buffers of chunk_size rows; a full buffer is handed to a
+    # background thread that compresses it column by column, appends it to
+    # the file and returns the buffer to the ring. Recording never waits:
+    # if every buffer is still queued for writing, events are dropped and
+    # counted in `dropped`.
+    def __init__(self, path, seed=0, chunk_size=4096, chunks=8, level=1):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.level = level
+        self.buffers = [np.zeros(chunk_size, EVENT) for _ in range(chunks)]
+        self.free = deque(self.buffers[1:])
+        self.buffer = self.buffers[0]
+        self.row = 0
+        self.frame = 0
+        self.dropped = 0
+        self.chunks_written = 0
+
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, chunk_size))
+        # Readers can open the log as soon as it exists
+        self.file.flush()
+        self.pending = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def begin_frame(self, time, dt):
+        self.frame += 1
+        self.record(FRAME, time, value=dt)
+
+    def record(self, kind, time, x=0.0, y=0.0, value=0.0):
+        buffer = self.buffer
+        if buffer is None:
+            buffer = self.next_buffer()
+            if buffer is None:
+                self.dropped += 1
+                return
+        row = self.row
+        buffer[row] = (self.frame, time, kind, x, y, value)
+        self.row = row + 1
+        if self.row == self.chunk_size:
+            self.submit()
+
+    def record_many(self, kind, time, x, y, value):
+        # One event per element of the x, y and value arrays
+        done = 0
+        n = len(x)
+        while done < n:
+            buffer = self.buffer
+            if buffer is None:
+                buffer = self.next_buffer()
+                if buffer is None:
+                    self.dropped += n - done
+                    return
+            row = self.row
+            take = min(n - done, self.chunk_size - row)
+            rows = buffer[row:row + take]
+            rows["frame"] = self.frame
+            rows["time"] = time
+            rows["kind"] = kind
+            rows["x"] = x[done:done + take]
+            rows["y"] = y[done:done + take]
+            rows["value"] = value[done:done + take]
+            done += take
+            self.row = row + take
+            if self.row == self.chunk_size:
+                self.submit()
+
+    def next_buffer(self):
+        if self.free:
+            self.buffer = self.free.popleft()
+            self.row = 0
+        return self.buffer
+
+    def submit(self):
+        self.pending.put((self.buffer, self.row))
+        self.buffer = None
+        self.row = 0
+
+    def write_loop(self):
+        # Background thread: zlib releases the GIL while it compresses, so
+        # this runs alongside the game loop
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            buffer, rows = item
+            columns = [zlib.compress(buffer[name][:rows].tobytes(), self.level)
+                       for name in EVENT.names]
+            self.file.write(CHUNK.pack(rows, *(len(column) for column in columns)))
+            for column in columns:
+                self.file.write(column)
+            self.file.flush()
+            self.chunks_written += 1
+            self.free.append(buffer)
+
+    def close(self):
+        # Write out the partly filled buffer and wait for the writer
+        if self.buffer is not None and self.row:
+            self.submit()
+        self.pending.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+class TelemetryReader:
+    # Memory-mapped reader for TelemetryLog files. Chunks are located by
+    # walking their headers, and only the columns asked for are unpacked.
+    # Iterating streams one chunk at a time; read() concatenates them. A log
+    # whose header is not on disk yet reads as having no chunks.
+    def __init__(self, path):
+        self.seed = self.chunk_size = None
+        # (rows, offset of every column) per complete chunk
+        self.index = []
+        with open(path, "rb") as f:
+            # An empty file cannot be mapped
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                self.data = b""
+                return
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.seed, self.chunk_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError("not a Rail Shooter telemetry log")
+        if version != VERSION:
+            raise ValueError(f"unsupported telemetry log version {version}")
+
+        offset = HEADER.size
+        size = len(self.data)
+        while offset + CHUNK.size <= size:
+            rows, *lengths = CHUNK.unpack_from(self.data, offset)
+            offset += CHUNK.size
+            if offset + sum(lengths) > size:
+                break  # still being written
+            columns = {}
+            for name, length in zip(EVENT.names, lengths):
+                columns[name] = (offset, length)
+                offset += length
+            self.index.append((rows, columns))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        for i in range(len(self.index)):
+            yield self.chunk(i)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def chunk(self, i, columns=None):
+        rows, offsets = self.index[i]
+        result = {}
+        for name in columns or EVENT.names:
+            offset, length = offsets[name]
+            raw = zlib.decompress(self.data[offset:offset + length])
+            result[name] = np.frombuffer(raw, dtype=EVENT[name], count=rows)
+        return result
+
+    def read(self, columns=None):
+        names = columns or EVENT.names
+        chunks = [self.chunk(i, names) for i in range(len(self.index))]
+        return {name: np.concatenate([chunk[name] for chunk in chunks])
+                if chunks else np.zeros(0, EVENT[name]) for name in names}
+
+
+def summarize(path):
+    reader = TelemetryReader(path)
+    events = reader.read()
+    reader.close()
+    kinds = np.bincount(events["kind"], minlength=len(KIND_NAMES))
+    print(f"{len(reader)} chunks, {len(events['kind'])} events, "
+          f"{int(events['frame'].max()) if len(events['frame']) else 0} frames")
+    for name, count in zip(KIND_NAMES, kinds.tolist()):
+        print(f"  {name:<16}{count:>10}")
+    dt = events["value"][events["kind"] == FRAME] * 1000
+    if len(dt):
+        p50, p95, p99 = np.percentile(dt, (50, 95, 99))
+        print(f"  frame ms        p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {dt.max():.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Rail Shooter telemetry log")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    summarize(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Swept bullet-vs-enemy tests and the grid broad phase that feeds them
+import math
+
+import numpy as np
+
+from collision import grid_pairs, swept_contact
+
+
+def boxes(*rows):
+    return tuple(np.array(column, dtype=np.float64) for column in zip(*rows))
+
+
+def test_fast_bullet_does_not_tunnel():
+    # 100 px in one long tick, straight through an enemy 40 px across:
+    # neither end of the step is inside it
+    assert math.hypot(0 - 50, 0) > 20 and math.hypot(100 - 50, 0) > 20
+    t = swept_contact(0.0, 0.0, 100.0, 0.0, 50.0, 0.0, 50.0, 0.0, 20.0)
+    assert t == 0.3
+
+
+def test_moving_enemy_is_hit_on_the_way():
+    # Bullet and enemy cross paths head-on and would swap sides in one tick
+    t = swept_contact(0.0, 0.0, 60.0, 0.0, 60.0, 0.0, 0.0, 0.0, 10.0)
+    assert math.isclose(t, 25 / 60)
+
+
+def test_bullet_starting_inside_hits_at_once():
+    t = swept_contact(45.0, 0.0, 200.0, 0.0, 50.0, 0.0, 50.0, 0.0, 20.0)
+    assert t == 0.0
+
+
+def test_near_tangent_pass():
+    # Passing just outside the radius misses, just inside hits
+    miss, hit = swept_contact(np.array([0.0, 0.0]), np.array([20.01, 19.99]),
+                              np.array([100.0, 100.0]), np.array([20.01, 19.99]),
+                              50.0, 0.0, 50.0, 0.0, 20.0)
+    assert miss == np.inf
+    assert 0.0 < hit < 1.0
+
+
+def test_stopping_short_misses():
+    t = swept_contact(0.0, 0.0, 25.0, 0.0, 50.0, 0.0, 50.0, 0.0, 20.0)
+    assert t == np.inf
+
+
+def test_pair_spanning_many_cells_is_reported_once():
+    # Both boxes cover a 4x4 block of 32 px cells and share nine of them
+    a = boxes((0, 0, 127, 127), (500, 500, 510, 510))
+    b = boxes((40, 40, 160, 160), (505, 0, 520, 10))
+    pairs = list(zip(*(index.tolist() for index in grid_pairs(a, b))))
+    assert pairs == [(0, 0)]
+
+
+def test_grid_pairs_match_brute_force():
+    rng = np.random.default_rng(7)
+    def random_boxes(n, size):
+        x, y = rng.uniform(-200, 400, n), rng.uniform(-200, 400, n)
+        w, h = rng.uniform(1, size, n), rng.uniform(1, size, n)
+        return x, y, x + w, y + h
+    a, b = random_boxes(60, 100), random_boxes(40, 30)
+    expected = {(i, j) for i in range(60) for j in range(40)
+                if a[0][i] <= b[2][j] and b[0][j] <= a[2][i]
+                and a[1][i] <= b[3][j] and b[1][j] <= a[3][i]}
+    found = list(zip(*(index.tolist() for index in grid_pairs(a, b))))
+    assert len(found) == len(set(found))
+    assert set(found) == expected
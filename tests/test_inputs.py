@@ -0,0 +1,54 @@
+# Input events queued by the pipelined loop and the ticks they end up in,
+# and the input logs they are recorded to
+import pygame
+
+from inputs import InputLog, InputQueue, TickInput
+from rail_shooter import GameState, RailShooter
+from replay import replay
+
+
+def test_queued_key_presses_reach_the_tick():
+    game = RailShooter(headless=True, seed=3)
+    inputs = InputQueue()
+    assert game.queue_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE), 0.0, inputs)
+    assert game.queue_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r), 0.5, inputs)
+    assert not game.queue_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3), 0.5, inputs)
+
+    tick = inputs.take(0.01, TickInput(10, 0, 0))
+    assert tick.slow_motion and not tick.reset
+    tick = inputs.take(1.0, TickInput(10, 0, 0))
+    assert tick.reset and not tick.slow_motion
+
+
+def test_input_log_round_trip(tmp_path):
+    log = InputLog(42)
+    log.append(TickInput(10, 600, 400))
+    log.append(TickInput(10, 12, 34, shots=[(1, 2), (1199, 799)], slow_motion=True))
+    log.append(TickInput(16, 0, 0, reset=True))
+    log.finish(1234, bytes(range(20)))
+    log.save(tmp_path / "session.rsil")
+
+    loaded = InputLog.load(tmp_path / "session.rsil")
+    assert (loaded.seed, loaded.final_score, loaded.final_digest) == (42, 1234, bytes(range(20)))
+    assert [(t.dt_ms, t.crosshair_x, t.crosshair_y, t.shots, t.slow_motion, t.reset)
+            for t in loaded.ticks] == [
+        (10, 600, 400, [], False, False),
+        (10, 12, 34, [(1, 2), (1199, 799)], True, False),
+        (16, 0, 0, [], False, True),
+    ]
+
+
+def test_any_seed_can_be_recorded(tmp_path):
+    for seed in (-1, 2**64 + 5):
+        game = RailShooter(headless=True, seed=seed)
+        log = InputLog(game.seed)
+        for _ in range(200):
+            tick = TickInput(10, game.crosshair_x, game.crosshair_y)
+            log.append(tick)
+            game.apply_input(tick)
+            if game.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+                game.update(0.01)
+        log.finish(game.score, game.state_digest())
+        log.save(tmp_path / "session.rsil")
+
+        assert replay(InputLog.load(tmp_path / "session.rsil")).ok
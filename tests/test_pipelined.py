@@ -0,0 +1,37 @@
+# The pipelined loop simulates on its own thread while the main thread
+# polls input and draws; its recordings replay like run()'s
+import threading
+import time
+
+import pygame
+
+from inputs import InputLog
+from rail_shooter import RailShooter
+from replay import replay
+
+
+def test_pipelined_session_replays(tmp_path, monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    game = RailShooter(seed=9)
+    drawn_on = set()
+    draw = game.draw
+    def draw_and_note(alpha=1.0):
+        drawn_on.add(threading.current_thread())
+        draw(alpha)
+    game.draw = draw_and_note
+
+    def play():
+        time.sleep(0.3)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(600, 200)))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        time.sleep(0.3)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+    threading.Thread(target=play).start()
+    game.run_pipelined(record_to=str(tmp_path / "session.rsil"))
+
+    assert drawn_on == {threading.main_thread()}
+    log = InputLog.load(tmp_path / "session.rsil")
+    assert sum(len(tick.shots) for tick in log.ticks) == 1
+    assert any(tick.slow_motion for tick in log.ticks)
+    assert replay(log).ok
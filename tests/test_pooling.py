@@ -0,0 +1,30 @@
+# Entity tables are the pools entities are recycled through: spawning,
+# removing and restarting reuse the same column arrays
+from rail_shooter import RailShooter
+
+
+def columns(table):
+    return {name: getattr(table, name) for name in table.fields}
+
+
+def test_tables_recycle_rows():
+    game = RailShooter(headless=True, seed=5)
+    for _ in range(40):
+        game.bullets.spawn(600, 700, 600, 0)
+        game.enemies.spawn(600, 100)
+    game.power_ups.spawn(300, 100)
+    before = {name: columns(table) for name, table in game.world.tables.items()}
+
+    game.enemies.active[:20] = False
+    game.world.compact()
+    assert game.enemies.count == 20
+    game.reset_game()
+    assert all(count == 0 for count in game.entity_counts().values())
+    for _ in range(40):
+        game.bullets.spawn(600, 700, 600, 0)
+        game.enemies.spawn(600, 100)
+    game.create_explosion(600, 400)
+
+    for name, table in game.world.tables.items():
+        for column, array in columns(table).items():
+            assert array is before[name][column], (name, column)
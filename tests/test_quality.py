@@ -0,0 +1,93 @@
+# Adaptive quality: when QualityScaler steps detail down or back up, and
+# that --fixed-quality keeps full detail
+import time
+
+import pygame
+import pytest
+
+from quality import LEVELS, QualityScaler
+from rail_shooter import RailShooter
+
+
+def feed(scaler, frame_ms, frames):
+    # Levels after each of `frames` frames of frame_ms
+    levels = []
+    for _ in range(frames):
+        scaler.observe(frame_ms)
+        levels.append(scaler.level)
+    return levels
+
+
+def test_steps_down_after_a_window_over_budget():
+    scaler = QualityScaler(10.0, window=30)
+    levels = feed(scaler, 12.0, 30)
+    assert levels == [0] * 29 + [1]
+    # The window starts over after every change
+    assert feed(scaler, 12.0, 30) == [1] * 29 + [2]
+    assert [(d.old_level, d.new_level, d.frame) for d in scaler.decisions] == [(0, 1, 30), (1, 2, 60)]
+
+
+def test_never_below_the_last_level():
+    scaler = QualityScaler(10.0, window=5)
+    feed(scaler, 50.0, 100)
+    assert scaler.level == len(LEVELS) - 1
+
+
+def test_no_flip_flop_around_the_threshold():
+    # After one step down, frames hovering between the restore (6 ms) and
+    # degrade (9 ms) thresholds neither shed more detail nor bring it back
+    scaler = QualityScaler(10.0, window=30, restore_frames=120)
+    feed(scaler, 12.0, 30)
+    levels = []
+    for _ in range(300):
+        levels += feed(scaler, 8.9, 1) + feed(scaler, 6.1, 1)
+    assert set(levels) == {1}
+    assert len(scaler.decisions) == 1
+
+
+def test_restores_one_step_at_a_time():
+    scaler = QualityScaler(10.0, window=30, restore_frames=120)
+    feed(scaler, 20.0, 60)
+    assert scaler.level == 2
+    levels = feed(scaler, 5.0, 240)
+    assert levels[118] == 2 and levels[119] == 1
+    assert levels[238] == 1 and levels[239] == 0
+
+
+def test_a_slow_frame_restarts_the_restore_count():
+    scaler = QualityScaler(10.0, window=30, restore_frames=120)
+    feed(scaler, 20.0, 30)
+    feed(scaler, 5.0, 100)
+    feed(scaler, 7.0, 1)
+    assert feed(scaler, 5.0, 119)[-1] == 1
+    assert feed(scaler, 5.0, 1) == [0]
+
+
+@pytest.mark.parametrize("adaptive", [True, False])
+def test_fixed_quality_keeps_full_detail(monkeypatch, adaptive):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    game = RailShooter(seed=1)
+    game.quality = QualityScaler(1.0, window=5)
+    applied = []
+    apply_quality = game.apply_quality
+    def note_and_apply(level):
+        applied.append(level)
+        apply_quality(level)
+    game.apply_quality = note_and_apply
+    draw = game.draw
+    frames = []
+    def slow_draw(alpha=1.0):
+        draw(alpha)
+        time.sleep(0.002)
+        frames.append(alpha)
+        if len(frames) == 20:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.draw = slow_draw
+
+    game.run(uncapped=True, adaptive_quality=adaptive)
+    if adaptive:
+        assert game.quality_level > 0 and applied
+    else:
+        assert game.quality_level == 0 and not applied
+        assert len(game.quality.decisions) == 0
@@ -0,0 +1,43 @@
+# Snapshots restore a game exactly and it carries on as if never stopped
+from inputs import TickInput
+from rail_shooter import GameState, RailShooter
+
+
+def played_game(ticks=600):
+    game = RailShooter(headless=True, seed=11)
+    for i in range(ticks):
+        tick = TickInput(10, game.crosshair_x, game.crosshair_y)
+        if game.enemies.count and i % 5 == 0:
+            tick.shots.append((int(game.enemies.x[0]), int(game.enemies.y[0])))
+        game.apply_input(tick)
+        if game.state in [GameState.PLAYING, GameState.SLOW_MOTION]:
+            game.update(0.01)
+    return game
+
+
+def test_snapshot_round_trip():
+    game = played_game()
+    for compress in (False, True):
+        data = game.snapshot(compress=compress)
+        copy = RailShooter(headless=True, seed=0)
+        copy.restore(data)
+        assert copy.state_digest() == game.state_digest()
+        assert copy.snapshot(compress=compress) == data
+
+
+def test_snapshot_continues_identically():
+    game = played_game()
+    copy = RailShooter(headless=True, seed=0)
+    copy.restore(game.snapshot())
+    for _ in range(300):
+        game.update(0.01)
+        copy.update(0.01)
+    assert copy.state_digest() == game.state_digest()
+
+
+def test_snapshot_of_any_seed():
+    game = RailShooter(headless=True, seed=-3)
+    copy = RailShooter(headless=True, seed=0)
+    copy.restore(game.snapshot())
+    assert copy.seed == game.seed == 2**64 - 3
+    assert copy.state_digest() == game.state_digest()
@@ -0,0 +1,62 @@
+# Telemetry logs read back what was recorded, also while a session is
+# still writing them
+import time
+
+import numpy as np
+
+from telemetry import FRAME, KILL, TelemetryLog, TelemetryReader
+
+
+def test_telemetry_round_trip(tmp_path):
+    path = tmp_path / "session.rstl"
+    log = TelemetryLog(path, seed=7, chunk_size=4)
+    for i in range(12):
+        log.begin_frame(i * 0.01, float(i))
+    log.record_many(KILL, 0.5, np.arange(6, dtype=np.float32), np.zeros(6, np.float32),
+                    np.arange(100, 106, dtype=np.float64))
+    log.record(FRAME, 0.6, value=12.0)
+    log.close()
+
+    reader = TelemetryReader(path)
+    events = reader.read()
+    reader.close()
+    assert log.dropped == 0
+    assert reader.seed == 7
+    assert events["value"].tolist() == [float(i) for i in range(12)] + list(range(100, 106)) + [12.0]
+    assert events["frame"].tolist() == list(range(1, 13)) + [12] * 7
+    assert events["kind"].tolist() == [FRAME] * 12 + [KILL] * 6 + [FRAME]
+    assert events["x"][12:18].tolist() == list(range(6))
+
+
+def chunks_in(path):
+    reader = TelemetryReader(path)
+    count = len(reader)
+    reader.close()
+    return count
+
+
+def test_reading_a_log_being_written(tmp_path):
+    path = tmp_path / "session.rstl"
+    path.write_bytes(b"")
+    assert chunks_in(path) == 0
+    path.write_bytes(b"RSTL\x01")
+    assert chunks_in(path) == 0
+
+    log = TelemetryLog(path, seed=7, chunk_size=4)
+    reader = TelemetryReader(path)
+    assert (len(reader), reader.seed, reader.chunk_size) == (0, 7, 4)
+    assert len(reader.read()["kind"]) == 0
+    reader.close()
+
+    for i in range(6):
+        log.record(KILL, i * 0.01, value=100.0)
+    deadline = time.monotonic() + 5
+    while log.chunks_written < 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    reader = TelemetryReader(path)
+    assert len(reader) == 1
+    assert reader.read()["time"].tolist() == [0.0, 0.01, 0.02, 0.03]
+    reader.close()
+
+    log.close()
+    assert chunks_in(path) == 2
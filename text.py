@@ -0,0 +1,32 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    # Bounded LRU of rendered text surfaces keyed on (font, text, color).
+    # A HUD string is only rasterized again when its displayed value changes.
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, color):
+        key = (id(font), text, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()